@@ -1,19 +1,13 @@
 import streamlit as st
-import sqlite3
-import pandas as pd
-from datetime import datetime, time
-import threading
+import io
+from datetime import datetime, date, time
 import time as time_module
 import os
-import webbrowser
-import re
-import scrapetube
 
 # 데이터베이스 초기화
 from database.schedule_db import (
     init_db, 
     add_schedule, 
-    get_schedules, 
     delete_schedule, 
     update_schedule, 
     toggle_schedule, 
@@ -21,26 +15,40 @@ from database.schedule_db import (
     get_current_video, 
     set_current_video,
     clear_current_video,
-    check_schedule
+    extract_youtube_id,
+    list_schedules,
+    count_schedules
 )
+from database.videos import format_duration, upsert_videos
+from database.scheduler import start_scheduler
+from database.daemon import read_status as read_daemon_status
+from database.now_playing import REFRESH_SECONDS as NOW_PLAYING_REFRESH_SECONDS
+from database.play_queue import play_queue
+from database.bulk import detect_format, import_schedules, export_schedules
+from database.recurrence import DEFAULT_RULE, WEEKDAY_NAMES, describe_rule
+from youtube.search import search_videos, search_categories
+from youtube.search_session import load_more
+from youtube.thumbnails import thumbnail_cache
+from monitoring.metrics import metrics
+from monitoring.logs import configure_logging
 
 # 페이지 설정
 st.set_page_config(page_title="비디오 스케줄러", page_icon="🎬", layout="wide")
 
 
 
+# 로그는 백그라운드 스레드가 logs/app.log에 기록 (프로세스당 한 번만 설정됨)
+configure_logging('app')
+
 # 세션 상태 초기화
-if 'scheduler_started' not in st.session_state:
-    st.session_state.scheduler_started = False
+if 'db_initialized' not in st.session_state:
     init_db()
-    
-    # 백그라운드 스케줄러 시작
-    scheduler_thread = threading.Thread(target=check_schedule, daemon=True)
-    scheduler_thread.start()
-    st.session_state.scheduler_started = True
-    # Sets a flag to prevent creating multiple threads. 
-    # Without this, every time Streamlit reruns (which happens often), 
-    # it would create a new scheduler thread, leading to duplicates.
+    st.session_state.db_initialized = True
+
+# 백그라운드 스케줄러 시작 (서버 프로세스당 하나만 실행)
+# 세션마다 스레드를 만들지 않고 프로세스 전역 런타임에 연결한다.
+# 다른 프로세스가 이미 실행 중이면 대기(standby) 상태로 남는다.
+scheduler_info = start_scheduler()
 # 편집 모드 세션 상태 초기화
 if 'editing_id' not in st.session_state:
     st.session_state.editing_id = None
@@ -54,37 +62,181 @@ if 'search_history' not in st.session_state:
     st.session_state.search_history = []
 if 'selected_category' not in st.session_state:
     st.session_state.selected_category = "Music"
+# "더 보기"에 쓰는 현재 검색 (검색어, 카테고리)와 이미 가져온 결과 수
+if 'search_context' not in st.session_state:
+    st.session_state.search_context = None
+    st.session_state.search_offset = 0
+
+# 반복 규칙 선택 위젯
+RECURRENCE_OPTIONS = {"매일": "daily", "요일 지정": "weekdays", "특정 날짜": "date", "N분마다": "every", "cron 식": "cron"}
+
+def recurrence_input(key_prefix, current_rule=DEFAULT_RULE):
+    """반복 규칙 입력 위젯을 표시하고 규칙 문자열을 반환"""
+    current_kind, _, argument = (current_rule or DEFAULT_RULE).partition(':')
+    kinds = list(RECURRENCE_OPTIONS.values())
+    label = st.selectbox(
+        "반복",
+        options=list(RECURRENCE_OPTIONS),
+        index=kinds.index(current_kind) if current_kind in kinds else 0,
+        key=f"{key_prefix}_recurrence"
+    )
+    kind = RECURRENCE_OPTIONS[label]
+    # 기존 규칙과 종류가 같을 때만 기존 값을 기본값으로 사용
+    argument = argument if kind == current_kind else ""
+    
+    if kind == "weekdays":
+        default_days = [int(day) for day in argument.split(',') if day.strip()] if argument else list(range(5))
+        days = st.multiselect(
+            "요일",
+            options=list(range(7)),
+            default=default_days,
+            format_func=lambda day: WEEKDAY_NAMES[day],
+            key=f"{key_prefix}_weekdays"
+        )
+        return "weekdays:" + ",".join(str(day) for day in sorted(days))
+    if kind == "date":
+        on_date = st.date_input("날짜", value=date.fromisoformat(argument) if argument else date.today(), key=f"{key_prefix}_date")
+        return f"date:{on_date.isoformat()}"
+    if kind == "every":
+        minutes = st.number_input("간격 (분)", min_value=1, max_value=1440, value=int(argument) if argument else 30, key=f"{key_prefix}_every")
+        return f"every:{int(minutes)}"
+    if kind == "cron":
+        expression = st.text_input("cron 식 (분 시 일 월 요일)", value=argument or "0 9 * * 1-5", key=f"{key_prefix}_cron")
+        return f"cron:{expression}"
+    return "daily"
+
+# 진단 패널용 시간 표시 (초 → ms/s)
+def format_seconds(seconds):
+    if seconds is None:
+        return "-"
+    return f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.1f}s"
+
+# 사이드바 진단 패널 (스케줄러 지표와 이 프로세스의 검색 지표)
+def render_diagnostics(scheduler_metrics, local_metrics):
+    lag = scheduler_metrics.get('scheduler_fire_lag_seconds') or {}
+    tick = scheduler_metrics.get('scheduler_tick_seconds') or {}
+    db_time = scheduler_metrics.get('scheduler_db_seconds') or {}
+    st.caption(f"⏱️ 재생 지연 p50 {format_seconds(lag.get('p50'))} · p95 {format_seconds(lag.get('p95'))} · 최대 {format_seconds(lag.get('max'))}")
+    st.caption(f"🔁 틱 p95 {format_seconds(tick.get('p95'))} · DB p95 {format_seconds(db_time.get('p95'))} ({tick.get('count', 0)}회)")
+    st.caption(f"📋 조회 {scheduler_metrics.get('scheduler_scanned_total', 0)} · 재생 {scheduler_metrics.get('scheduler_fired_total', 0)} · 놓침 {scheduler_metrics.get('scheduler_missed_total', 0)}")
+    
+    search = local_metrics.get('search_seconds') or {}
+    hits = local_metrics.get('search_cache_hits_total', 0) + local_metrics.get('search_cache_stale_hits_total', 0)
+    lookups = hits + local_metrics.get('search_cache_misses_total', 0)
+    hit_rate = f"{hits / lookups:.0%}" if lookups else "-"
+    st.caption(f"🔍 검색 p95 {format_seconds(search.get('p95'))} · 캐시 적중률 {hit_rate} ({lookups}회)")
 
-# Helper function to extract YouTube video ID
-def extract_youtube_id(url):
-    youtube_regex = r'(?:youtube\.com\/(?:[^\/]+\/.+\/|(?:v|e(?:mbed)?)\/|.*[?&]v=)|youtu\.be\/)([^"&?\/\s]{11})'
-    match = re.search(youtube_regex, url)
-    return match.group(1) if match else None    
+# 검색 결과 한 건 표시 (재생/스케줄 추가 버튼 포함)
+def render_search_result(idx, video):
+    with st.container():
+        col1, col2 = st.columns([1, 3])
+        
+        with col1:
+            # 썸네일 표시 (로컬 캐시 우선, 실패하면 YouTube 주소 사용)
+            thumbnail = thumbnail_cache.get(video.get('videoId'))
+            thumbnail_url = video['thumbnails'][0]['url'] if video.get('thumbnails') else ""
+            if thumbnail:
+                st.image(thumbnail, width='stretch')
+            elif thumbnail_url:
+                st.image(thumbnail_url, width='stretch')
+        
+        with col2:
+            # 제목과 정보
+            st.markdown(f"**{video['title']}**")
+            st.caption(f"👤 {video.get('channel', {}).get('name', 'Unknown')}")
+            st.caption(f"⏱️ {video.get('duration', 'N/A')} | 👁️ {video.get('viewCount', {}).get('short', 'N/A')}")
+            
+            # 카테고리 정보 표시
+            if video.get('category'):
+                st.caption(f"🏷️ 카테고리: {video['category']}")
+            
+            # URL 표시
+            video_url = video['link']
+            st.text(f"URL: {video_url}")
+            
+            # 버튼들 (재생, 선택)
+            btn_col1, btn_col2 = st.columns(2)
+            with btn_col1:
+                if st.button("▶️ 재생", key=f"search_play_{idx}", type="primary"):
+                    # Set as current video to play in the app
+                    set_current_video(video_url, video['title'], st.session_state)
+                    st.rerun()
+            with btn_col2:
+                if st.button("➕ 스케줄 추가", key=f"search_select_{idx}", type="secondary"):
+                    st.session_state.selected_video = video
+        
+        # 선택된 비디오에 대한 스케줄 추가 폼
+        if st.session_state.selected_video and st.session_state.selected_video['link'] == video['link']:
+            with st.expander("⏰ 스케줄 설정", expanded=True):
+                st.info(f"선택된 비디오: {video['title']}")
+                
+                schedule_col1, schedule_col2 = st.columns(2)
+                with schedule_col1:
+                    schedule_title = st.text_input(
+                        "스케줄 제목", 
+                        value=video['title'][:50],
+                        key=f"search_schedule_title_{idx}"
+                    )
+                with schedule_col2:
+                    schedule_time_input = st.text_input(
+                        "재생 시간 (서울 시간)", 
+                        value="00:00",
+                        help="24시간 형식 서울 시간으로 입력",
+                        key=f"search_schedule_time_{idx}"
+                    )
+                
+                button_col1, button_col2 = st.columns(2)
+                with button_col1:
+                    if st.button("✅ 스케줄 추가", key=f"search_add_schedule_{idx}", type="primary", width='stretch'):
+                        if schedule_title and schedule_time_input:
+                            # Convert local time to UTC
+                            #utc_time = local_to_utc(schedule_time_input, st.session_state.timezone_offset)
+                            utc_time = schedule_time_input
+                            upsert_videos([video])
+                            try:
+                                add_schedule(utc_time, video_url, "youtube", schedule_title, video.get('category', 'Music'),
+                                             video_id=video['videoId'])
+                                st.success(f"✅ '{schedule_title}' 스케줄이 서울 시간 {schedule_time_input} (UTC {utc_time})에 추가되었습니다! (카테고리: {video.get('category', 'Music')})")
+                                st.session_state.selected_video = None
+                                time_module.sleep(1)
+                                st.rerun()
+                            except ValueError as e:
+                                st.error(f"⚠️ {e}")
+                        else:
+                            st.error("⚠️ 제목과 시간을 모두 입력해주세요.")
+                
+                with button_col2:
+                    if st.button("❌ 취소", key=f"search_cancel_schedule_{idx}", width='stretch'):
+                        st.session_state.selected_video = None
+                        st.rerun()
+        
+        st.markdown("---")
 
 # UI
 st.title("🎬 비디오 스케줄러")
 
 # 현재 재생 중인 비디오 표시
-try:
-    print(st.session_state)
-    current_video = get_current_video(st.session_state)
-    # print(f"현재 재생 중인 비디오 정보: {current_video}")  # 디버깅용 로그
-except Exception as e:
-    st.error(f"비디오 정보를 불러오는 중 오류가 발생했습니다: {e}")
-    current_video = None
-
-if current_video and isinstance(current_video, dict):
+# 새 비디오가 재생되면 페이지 전체가 아니라 이 fragment만 다시 그림
+@st.fragment(run_every=NOW_PLAYING_REFRESH_SECONDS)
+def render_now_playing():
     try:
-        st.subheader("🎬 현재 재생 중인 비디오")
+        current_video = get_current_video(st.session_state)
+        # print(f"현재 재생 중인 비디오 정보: {current_video}")  # 디버깅용 로그
+    except Exception as e:
+        st.error(f"비디오 정보를 불러오는 중 오류가 발생했습니다: {e}")
+        current_video = None
+
+    if current_video and isinstance(current_video, dict):
+        try:
+            st.subheader("🎬 현재 재생 중인 비디오")
         
-        # 비디오 제목 안전하게 표시
-        title = current_video.get('title', '제목 없음')
-        file_path = current_video.get('file_path', '')
+            # 비디오 제목 안전하게 표시
+            title = current_video.get('title', '제목 없음')
+            file_path = current_video.get('file_path', '')
         
-        st.info(f"**{title} url: {file_path}**")
+            st.info(f"**{title} url: {file_path}**")
         
-        # 비디오 플레이어 (전체 너비)
-        if file_path and ('youtube.com' in file_path or 'youtu.be' in file_path):
+            # 비디오 플레이어 (전체 너비)
             video_id = extract_youtube_id(file_path)
             if video_id:
                 embed_url = f"https://www.youtube.com/embed/{video_id}?autoplay=1"
@@ -96,27 +248,35 @@ if current_video and isinstance(current_video, dict):
                         allowfullscreen>
                 </iframe>
                 """, unsafe_allow_html=True)
-            else:
+            elif file_path:
+                # 로컬 파일 또는 다른 URL
                 st.video(file_path, autoplay=True)
-        elif file_path:
-            # 로컬 파일 또는 다른 URL
-            st.video(file_path, autoplay=True)
-        else:
-            st.warning("⚠️ 잘못된 비디오 경로입니다.")
+            else:
+                st.warning("⚠️ 잘못된 비디오 경로입니다.")
         
-        # 하단에 재생 정보와 중지 버튼
-        info_col, button_col = st.columns([3, 1])
-        with info_col:
-            timestamp = current_video.get('timestamp', 'N/A')
-            st.caption(f"재생 시간: {timestamp}")
-        with button_col:
-            if st.button("⏹️ 재생 중지", type="secondary"):
-                clear_current_video(st.session_state)
-                st.rerun()
-    except Exception as e:
-        st.error(f"비디오 재생 중 오류가 발생했습니다: {e}")
-        # 오류 발생 시 현재 비디오 정보 정리
-        clear_current_video(st.session_state)
+            # 하단에 재생 정보와 다음/중지 버튼
+            info_col, next_col, button_col = st.columns([2, 1, 1])
+            with info_col:
+                timestamp = current_video.get('timestamp', 'N/A')
+                st.caption(f"재생 시간: {timestamp}")
+                queued = play_queue.items(limit=3)
+                if queued:
+                    st.caption(f"📋 대기열 {len(play_queue)}개 - 다음: {', '.join(item['title'] or '제목 없음' for item in queued)}")
+            with next_col:
+                if st.button("⏭️ 다음", disabled=not queued, help="대기열의 다음 비디오 재생"):
+                    play_queue.advance(skip=True)
+                    st.rerun(scope="fragment")
+            with button_col:
+                if st.button("⏹️ 재생 중지", type="secondary", help="현재 비디오와 대기열 모두 중지"):
+                    play_queue.clear()
+                    clear_current_video(st.session_state)
+                    st.rerun(scope="fragment")
+        except Exception as e:
+            st.error(f"비디오 재생 중 오류가 발생했습니다: {e}")
+            # 오류 발생 시 현재 비디오 정보 정리
+            clear_current_video(st.session_state)
+
+render_now_playing()
 
 st.markdown("---")
 
@@ -141,6 +301,16 @@ with tab1:
     # 선택된 카테고리를 세션 상태에 저장
     st.session_state.selected_category = selected_category
     
+    # 여러 카테고리 동시 검색
+    multi_category = st.checkbox("🌐 여러 카테고리에서 한 번에 검색", key="multi_category_search")
+    if multi_category:
+        selected_categories = st.multiselect(
+            "검색할 카테고리",
+            options=category_options,
+            default=category_options,
+            key="multi_category_select"
+        )
+    
     st.markdown("---")
     
     # 검색 입력
@@ -174,6 +344,7 @@ with tab1:
         search_button = st.button("🔍 검색", type="primary", width='stretch')
     
     # 검색 실행
+    search_streamed = False
     if search_button and search_query:
         # 검색어를 기록에 추가 (중복 제거)
         if search_query not in st.session_state.search_history:
@@ -182,124 +353,74 @@ with tab1:
             if len(st.session_state.search_history) > 10:
                 st.session_state.search_history = st.session_state.search_history[-10:]
         
-        with st.spinner("검색 중..."):
-            try:
-                # 카테고리와 함께 검색 쿼리 구성
-                category_enhanced_query = f"{search_query} {selected_category}"
-                st.info(f"🔍 검색: '{category_enhanced_query}' (카테고리: {selected_category})")
-                
-                # scrapetube를 사용하여 YouTube 검색
-                videos = scrapetube.get_search(category_enhanced_query, limit=20)
-                results = []
-                
+        if multi_category:
+            # 카테고리별 검색을 병렬로 실행하고 끝나는 순서대로 결과를 바로 표시
+            st.info(f"🔍 검색: '{search_query}' (카테고리: {', '.join(selected_categories)})")
+            progress = st.empty()
+            st.markdown("---")
+            st.subheader("검색 결과")
+            results = []
+            finished = 0
+            for category, videos, error in search_categories(search_query, selected_categories):
+                finished += 1
+                progress.caption(f"⏳ {finished}/{len(selected_categories)} 카테고리 완료")
+                if error is not None:
+                    st.warning(f"'{category}' 검색 중 오류가 발생했습니다: {error}")
+                    continue
+                thumbnail_cache.get_many([video['videoId'] for video in videos])
                 for video in videos:
-                    video_id = video.get('videoId')
-                    if video_id:
-                        video_data = {
-                            'title': video.get('title', {}).get('runs', [{}])[0].get('text', 'No Title'),
-                            'link': f'https://www.youtube.com/watch?v={video_id}',
-                            'videoId': video_id,
-                            'thumbnails': [{'url': f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg'}],
-                            'channel': {
-                                'name': video.get('longBylineText', {}).get('runs', [{}])[0].get('text', 'Unknown')
-                            },
-                            'duration': video.get('lengthText', {}).get('simpleText', 'N/A'),
-                            'viewCount': {
-                                'short': video.get('shortViewCountText', {}).get('simpleText', 'N/A')
-                            },
-                            'category': selected_category,
-                            'search_query': search_query
-                        }
-                        results.append(video_data)
+                    render_search_result(len(results), video)
+                    results.append(video)
+            progress.caption(f"✅ {len(results)}개의 결과를 찾았습니다! ({finished}개 카테고리)")
+            st.session_state.search_results = results
+            st.session_state.search_context = None
+            search_streamed = True
+        else:
+            with st.spinner("검색 중..."):
+                try:
+                    # 카테고리와 함께 검색 쿼리 구성
+                    category_enhanced_query = f"{search_query} {selected_category}"
+                    st.info(f"🔍 검색: '{category_enhanced_query}' (카테고리: {selected_category})")
+                
+                    # 검색 캐시를 거쳐 YouTube 검색 (같은 검색어는 다시 스크랩하지 않음)
+                    results = search_videos(search_query, selected_category)
                 
-                st.session_state.search_results = results
-                st.success(f"✅ {len(st.session_state.search_results)}개의 결과를 찾았습니다!")
-            except Exception as e:
-                st.error(f"검색 중 오류가 발생했습니다: {e}")
-                st.session_state.search_results = []
+                    st.session_state.search_results = results
+                    st.session_state.search_context = (search_query, selected_category)
+                    st.session_state.search_offset = len(results)
+                    st.success(f"✅ {len(st.session_state.search_results)}개의 결과를 찾았습니다!")
+                except Exception as e:
+                    st.error(f"검색 중 오류가 발생했습니다: {e}")
+                    st.session_state.search_results = []
     
-    # 검색 결과 표시
-    if st.session_state.search_results:
+    # 검색 결과 표시 (여러 카테고리 검색은 위에서 이미 표시됨)
+    if st.session_state.search_results and not search_streamed:
         st.markdown("---")
         st.subheader("검색 결과")
         
+        # 썸네일을 병렬로 미리 캐시
+        thumbnail_cache.get_many([video['videoId'] for video in st.session_state.search_results])
         for idx, video in enumerate(st.session_state.search_results):
-            with st.container():
-                col1, col2 = st.columns([1, 3])
-                
-                with col1:
-                    # 썸네일 표시
-                    thumbnail_url = video['thumbnails'][0]['url'] if video.get('thumbnails') else ""
-                    if thumbnail_url:
-                        st.image(thumbnail_url, width='stretch')
-                
-                with col2:
-                    # 제목과 정보
-                    st.markdown(f"**{video['title']}**")
-                    st.caption(f"👤 {video.get('channel', {}).get('name', 'Unknown')}")
-                    st.caption(f"⏱️ {video.get('duration', 'N/A')} | 👁️ {video.get('viewCount', {}).get('short', 'N/A')}")
-                    
-                    # 카테고리 정보 표시
-                    if video.get('category'):
-                        st.caption(f"🏷️ 카테고리: {video['category']}")
-                    
-                    # URL 표시
-                    video_url = video['link']
-                    st.text(f"URL: {video_url}")
-                    
-                    # 버튼들 (재생, 선택)
-                    btn_col1, btn_col2 = st.columns(2)
-                    with btn_col1:
-                        if st.button(f"▶️ 재생", key=f"search_play_{idx}", type="primary"):
-                            # Set as current video to play in the app
-                            set_current_video(video_url, video['title'], st.session_state)
-                            st.rerun()
-                    with btn_col2:
-                        if st.button(f"➕ 스케줄 추가", key=f"search_select_{idx}", type="secondary"):
-                            st.session_state.selected_video = video
-                
-                # 선택된 비디오에 대한 스케줄 추가 폼
-                if st.session_state.selected_video and st.session_state.selected_video['link'] == video['link']:
-                    with st.expander("⏰ 스케줄 설정", expanded=True):
-                        st.info(f"선택된 비디오: {video['title']}")
-                        
-                        schedule_col1, schedule_col2 = st.columns(2)
-                        with schedule_col1:
-                            schedule_title = st.text_input(
-                                "스케줄 제목", 
-                                value=video['title'][:50],
-                                key=f"search_schedule_title_{idx}"
-                            )
-                        with schedule_col2:
-                            schedule_time_input = st.text_input(
-                                "재생 시간 (서울 시간)", 
-                                value="00:00",
-                                help="24시간 형식 서울 시간으로 입력",
-                                key=f"search_schedule_time_{idx}"
-                            )
-                        
-                        button_col1, button_col2 = st.columns(2)
-                        with button_col1:
-                            if st.button("✅ 스케줄 추가", key=f"search_add_schedule_{idx}", type="primary", width='stretch'):
-                                if schedule_title and schedule_time_input:
-                                    # Convert local time to UTC
-                                    #utc_time = local_to_utc(schedule_time_input, st.session_state.timezone_offset)
-                                    utc_time = schedule_time_input
-                                    add_schedule(utc_time, video_url, "youtube", schedule_title, video.get('category', 'Music'))
-                                    st.success(f"✅ '{schedule_title}' 스케줄이 서울 시간 {schedule_time_input} (UTC {utc_time})에 추가되었습니다! (카테고리: {video.get('category', 'Music')})")
-                                    st.session_state.selected_video = None
-                                    time_module.sleep(1)
-                                    st.rerun()
-                                else:
-                                    st.error("⚠️ 제목과 시간을 모두 입력해주세요.")
-                        
-                        with button_col2:
-                            if st.button("❌ 취소", key=f"search_cancel_schedule_{idx}", width='stretch'):
-                                st.session_state.selected_video = None
-                                st.rerun()
-                
-                st.markdown("---")
-    else:
+            render_search_result(idx, video)
+        
+        # 다음 페이지 불러오기 (처음부터 다시 검색하지 않고 검색 generator를 이어서 사용)
+        if st.session_state.search_context and st.button("⬇️ 더 보기", key="search_load_more"):
+            query, category = st.session_state.search_context
+            shown = {video['videoId'] for video in st.session_state.search_results}
+            more = []
+            with st.spinner("결과를 더 불러오는 중..."):
+                while not more:
+                    page = load_more(query, category, st.session_state.search_offset)
+                    if not page:
+                        break
+                    st.session_state.search_offset += len(page)
+                    more = [video for video in page if video['videoId'] not in shown]
+            if more:
+                st.session_state.search_results.extend(more)
+                st.rerun()
+            else:
+                st.info("더 이상 검색 결과가 없습니다.")
+    elif not search_streamed:
         st.info("🔍 검색어를 입력하고 검색 버튼을 클릭하세요.")
         
 with tab2:
@@ -323,6 +444,7 @@ with tab2:
     with col1:
         title = st.text_input("제목", placeholder="예: 아침 운동 영상", key="title_input")
         schedule_time = st.text_input("재생 시간", value="00:00", help="HH:MM 형식으로 입력 (24시간제)", key="schedule_time_input")
+        recurrence = recurrence_input("new_schedule")
         
     with col2:
         file_type = st.radio("파일 유형", ["YouTube URL", "로컬 파일", "html"], horizontal=True)
@@ -348,11 +470,41 @@ with tab2:
                 st.warning("⚠️ 파일이 존재하지 않습니다. 경로를 확인해주세요.")
             
             if valid:
-                add_schedule(time_str, file_path, f_type, title, manual_selected_category)
-                st.success(f"✅ '{title}' 스케줄이 {time_str}에 추가되었습니다! (카테고리: {manual_selected_category})")
-                st.rerun()
+                try:
+                    add_schedule(time_str, file_path, f_type, title, manual_selected_category, recurrence)
+                    st.success(f"✅ '{title}' 스케줄이 {describe_rule(recurrence, time_str)}에 추가되었습니다! (카테고리: {manual_selected_category})")
+                    st.rerun()
+                except ValueError as e:
+                    st.error(f"⚠️ 스케줄을 저장할 수 없습니다: {e}")
         else:
             st.error("⚠️ 제목과 파일 경로를 모두 입력해주세요.")
+    
+    st.markdown("---")
+    
+    # 일괄 가져오기 / 내보내기 (CSV, JSON, JSON Lines)
+    with st.expander("📦 일괄 가져오기 / 내보내기"):
+        st.caption("열: schedule_time, file_path(또는 url), title, file_type, category, recurrence, is_active")
+        uploaded = st.file_uploader("가져올 파일", type=["csv", "json", "jsonl"], key="bulk_import_file")
+        if uploaded is not None and st.button("📥 가져오기", key="bulk_import"):
+            with st.spinner("가져오는 중..."):
+                report = import_schedules(
+                    io.TextIOWrapper(uploaded, encoding='utf-8-sig', newline=''), detect_format(uploaded.name))
+            st.success(f"✅ {report.imported}개 스케줄을 가져왔습니다.")
+            if report.duplicates:
+                st.info(f"같은 반복 규칙과 시간에 이미 예약된 비디오 {report.duplicates}개는 건너뛰었습니다.")
+            if report.failed:
+                st.warning(f"⚠️ {report.failed}개 행을 가져오지 못했습니다.")
+                st.table([{"행": row_number, "오류": message} for row_number, message in report.errors[:100]])
+        
+        export_format = st.radio("내보내기 형식", ["csv", "json"], horizontal=True, key="bulk_export_format")
+        if st.button("📤 내보내기 파일 만들기", key="bulk_export"):
+            output = io.StringIO()
+            export_schedules(output, export_format)
+            st.session_state.bulk_export_data = (export_format, output.getvalue())
+        if st.session_state.get('bulk_export_data'):
+            export_format, export_data = st.session_state.bulk_export_data
+            st.download_button("💾 다운로드", export_data, file_name=f"schedules.{export_format}",
+                               mime="text/csv" if export_format == "csv" else "application/json")
 
 with tab3:
     st.header("등록된 스케줄")
@@ -361,10 +513,41 @@ with tab3:
     current_time = datetime.now().strftime("%H:%M:%S")
     st.info(f"🕐 현재 시간: {current_time}")
     
-    schedules_df = get_schedules()
+    # 목록 필터 (DB에서 바로 걸러서 현재 페이지만 조회)
+    filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
+    with filter_col1:
+        filter_category = st.selectbox("카테고리", ["전체", "Music", "Health", "Business", "English", "History", "Travel", "Daily_Life"], key="list_filter_category")
+    with filter_col2:
+        filter_status = st.selectbox("상태", ["전체", "활성", "비활성"], key="list_filter_status")
+    with filter_col3:
+        filter_type = st.selectbox("파일 유형", ["전체", "youtube", "local", "html"], key="list_filter_type")
+    with filter_col4:
+        page_size = st.selectbox("페이지당", [10, 20, 50], index=1, key="list_page_size")
     
-    if not schedules_df.empty:
-        for idx, row in schedules_df.iterrows():
+    list_filters = {
+        'category': None if filter_category == "전체" else filter_category,
+        'is_active': None if filter_status == "전체" else filter_status == "활성",
+        'file_type': None if filter_type == "전체" else filter_type,
+    }
+    # 필터가 바뀌면 첫 페이지로 (페이지별 시작 커서를 스택으로 보관)
+    if st.session_state.get('list_filters') != (list_filters, page_size):
+        st.session_state.list_filters = (list_filters, page_size)
+        st.session_state.list_cursors = [None]
+    
+    total_schedules = count_schedules(**list_filters)
+    schedules, next_cursor = list_schedules(after=st.session_state.list_cursors[-1], limit=page_size, **list_filters)
+    
+    if schedules:
+        page_number = len(st.session_state.list_cursors)
+        first_index = (page_number - 1) * page_size + 1
+        st.caption(f"총 {total_schedules}개 중 {first_index}-{first_index + len(schedules) - 1}번째 (페이지 {page_number})")
+        
+
+        # YouTube 스케줄 썸네일을 병렬로 미리 캐시
+        thumbnail_cache.get_many([
+            row['video_id'] for row in schedules if row['file_type'] == 'youtube'
+        ])
+        for row in schedules:
             with st.container():
                 # 편집 모드인 경우
                 if st.session_state.editing_id == row['id']:
@@ -392,6 +575,7 @@ with tab3:
                             index=edit_category_options.index(current_category) if current_category in edit_category_options else 0,
                             key=f"edit_category_{row['id']}"
                         )
+                        edit_recurrence = recurrence_input(f"edit_{row['id']}", row.get('recurrence', DEFAULT_RULE))
                     
                     btn_col1, btn_col2 = st.columns(2)
                     with btn_col1:
@@ -407,10 +591,13 @@ with tab3:
                                 st.warning("⚠️ 파일이 존재하지 않습니다. 경로를 확인해주세요.")
                             
                             if valid:
-                                update_schedule(row['id'], edit_time, edit_file_path, f_type, edit_title, edit_category)
-                                st.session_state.editing_id = None
-                                st.success(f"✅ '{edit_title}' 스케줄이 수정되었습니다! (카테고리: {edit_category})")
-                                st.rerun()
+                                try:
+                                    update_schedule(row['id'], edit_time, edit_file_path, f_type, edit_title, edit_category, edit_recurrence)
+                                    st.session_state.editing_id = None
+                                    st.success(f"✅ '{edit_title}' 스케줄이 수정되었습니다! (카테고리: {edit_category})")
+                                    st.rerun()
+                                except ValueError as e:
+                                    st.error(f"⚠️ 스케줄을 저장할 수 없습니다: {e}")
                     
                     with btn_col2:
                         if st.button("❌ 취소", key=f"cancel_{row['id']}", use_container_width=True):
@@ -424,8 +611,11 @@ with tab3:
                     with col1:
                         # 썸네일 표시 (YouTube인 경우)
                         if row['file_type'] == 'youtube':
-                            video_id = extract_youtube_id(row['file_path'])
-                            if video_id:
+                            video_id = row['video_id']
+                            thumbnail = thumbnail_cache.get(video_id)
+                            if thumbnail:
+                                st.image(thumbnail, width='stretch')
+                            elif video_id:
                                 thumbnail_url = f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg'
                                 st.image(thumbnail_url, width='stretch')
                             else:
@@ -441,13 +631,19 @@ with tab3:
                         st.markdown(f"**{status} {row['title']}**")
                         
                         # 스케줄 정보
-                        st.caption(f"🕐 예약 시간: {row['schedule_time']}")
+                        st.caption(f"🕐 예약 시간: {describe_rule(row.get('recurrence'), row['schedule_time'])}")
+                        if row['is_active'] and row['next_run_at'] is not None:
+                            st.caption(f"⏭️ 다음 재생: {datetime.fromtimestamp(row['next_run_at']).strftime('%Y-%m-%d %H:%M')}")
                         
                         # 파일 타입과 카테고리
                         file_type_display = "📺 YouTube" if row['file_type'] == 'youtube' else "📁 로컬 파일" if row['file_type'] == 'local' else "🌐 HTML"
                         category_info = f" | 🏷️ {row.get('category', 'Music')}" if row.get('category') else ""
                         st.caption(f"{file_type_display}{category_info}")
                         
+                        # 비디오 메타데이터 (채널, 재생 시간)
+                        if row['channel'] or row['duration_seconds'] is not None:
+                            st.caption(f"👤 {row['channel'] or 'Unknown'} | ⏱️ {format_duration(row['duration_seconds'])}")
+                        
                         # 생성일
                         # st.caption(f"📅 등록일: {row.get('created_at', 'N/A')}")
                         
@@ -459,8 +655,11 @@ with tab3:
                         with btn_col1:
                             if st.button("🔄" if row['is_active'] else "▶️", key=f"toggle_{row['id']}", help="활성화/비활성화"):
                                 new_status = 0 if row['is_active'] else 1
-                                toggle_schedule(row['id'], new_status)
-                                st.rerun()
+                                try:
+                                    toggle_schedule(row['id'], new_status)
+                                    st.rerun()
+                                except ValueError as e:
+                                    st.error(f"⚠️ {e}")
                         
                         with btn_col2:
                             if st.button("▶️", key=f"schedule_play_{row['id']}", help="지금 재생", type="primary"):
@@ -484,6 +683,23 @@ with tab3:
                                 st.rerun()
                 
                 st.markdown("---")
+        
+        # 페이지 이동
+        prev_col, next_col = st.columns(2)
+        with prev_col:
+            if st.button("⬅️ 이전", key="list_prev_page", disabled=page_number == 1, use_container_width=True):
+                st.session_state.list_cursors.pop()
+                st.rerun()
+        with next_col:
+            if st.button("다음 ➡️", key="list_next_page", disabled=next_cursor is None, use_container_width=True):
+                st.session_state.list_cursors.append(next_cursor)
+                st.rerun()
+    elif total_schedules and len(st.session_state.list_cursors) > 1:
+        # 마지막 페이지의 스케줄이 모두 삭제된 경우 이전 페이지로
+        st.session_state.list_cursors.pop()
+        st.rerun()
+    elif any(value is not None for value in list_filters.values()):
+        st.info("🔎 조건에 맞는 스케줄이 없습니다.")
     else:
         st.info("📝 등록된 스케줄이 없습니다. '스케줄 추가' 탭에서 새 스케줄을 추가해보세요!")
 
@@ -496,13 +712,35 @@ with st.sidebar:
     3. 설정한 시간이 되면 자동으로 재생됩니다
     
     **참고사항:**
-    - 스케줄러는 30초마다 시간을 체크합니다
+    - 스케줄러는 예약된 시각에 맞춰 바로 재생합니다
     - 🟢 활성화된 스케줄만 재생됩니다
     - 로컬 파일은 전체 경로를 입력해야 합니다
     """)
     
     st.markdown("---")
-    st.info(f"🟢 스케줄러 실행 중")
+    daemon_info = None
+    if scheduler_info['state'] == 'running':
+        st.info("🟢 스케줄러 실행 중")
+        if scheduler_info['next_fire_at']:
+            st.caption(f"다음 재생 예정: {scheduler_info['next_fire_at'][:16].replace('T', ' ')}")
+    elif scheduler_info['state'] == 'standby':
+        daemon_info = read_daemon_status()
+        if daemon_info:
+            st.info(f"🟢 스케줄러 데몬 실행 중 (PID {daemon_info['pid']})")
+            if daemon_info.get('next_fire_at'):
+                st.caption(f"다음 재생 예정: {daemon_info['next_fire_at'][:16].replace('T', ' ')}")
+        else:
+            st.info("🟡 다른 프로세스의 스케줄러가 실행 중입니다")
+    else:
+        st.warning("🔴 스케줄러가 중지되었습니다")
+    
+    with st.expander("📈 진단"):
+        local_metrics = metrics.snapshot()
+        # 데몬이 스케줄러를 실행 중이면 데몬이 상태 파일에 남긴 지표 사용
+        scheduler_metrics = daemon_info.get('metrics') if daemon_info and daemon_info.get('metrics') else local_metrics
+        render_diagnostics(scheduler_metrics, local_metrics)
+        if st.checkbox("Prometheus 형식 보기", key="show_prometheus"):
+            st.code(metrics.render(), language="text")
     
     if st.button("🔄 새로고침"):
         st.rerun()
\ No newline at end of file
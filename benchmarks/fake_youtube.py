@@ -0,0 +1,63 @@
+# benchmarks/fake_youtube.py
+"""Offline stand-in for scrapetube search.
+
+Yields deterministic video dicts in the same shape scrapetube returns, so
+youtube.search_session.build_video_data and everything after it run unchanged.
+FakeSearch is resumable like youtube.search_session.ScrapetubeSearch.
+An optional per-result latency simulates the network.
+"""
+import hashlib
+import time as time_module
+
+from youtube import search_session
+
+# 검색어 하나가 돌려줄 최대 결과 수 (scrapetube는 페이지를 계속 이어서 가져옴)
+MAX_RESULTS = 200
+
+_ID_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+
+
+def fake_video_id(seed):
+    digest = hashlib.blake2b(seed.encode('utf-8'), digest_size=11).digest()
+    return ''.join(_ID_CHARS[byte % 64] for byte in digest)
+
+def fake_video(query, index):
+    video_id = fake_video_id(f"{query}#{index}")
+    views = (index * 7919 + len(query) * 104729) % 50_000_000
+    return {
+        'videoId': video_id,
+        'title': {'runs': [{'text': f"{query} - result {index + 1}"}]},
+        'longBylineText': {'runs': [{'text': f"Channel {index % 37}"}]},
+        'lengthText': {'simpleText': f"{3 + index % 9}:{index * 13 % 60:02d}"},
+        'shortViewCountText': {'simpleText': f"{views // 1000}K views"},
+        'viewCountText': {'simpleText': f"{views:,} views"},
+    }
+
+
+class FakeSearch:
+    """Iterator with the same contract as youtube.search_session.ScrapetubeSearch"""
+
+    def __init__(self, search_query, category, continuation=None, latency=0.0):
+        self.query = f"{search_query} {category}"
+        self.continuation = continuation
+        self.latency = latency
+        self._index = continuation['index'] if continuation else 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._index >= MAX_RESULTS:
+            raise StopIteration
+        if self.latency:
+            time_module.sleep(self.latency)
+        video = fake_video(self.query, self._index)
+        self._index += 1
+        self.continuation = {'index': self._index}
+        return video
+
+
+def install(latency=0.0):
+    """Point the shared search sessions (and so the search cache behind them) at the fake source"""
+    search_session.search_sessions.source = (
+        lambda search_query, category, continuation=None: FakeSearch(search_query, category, continuation, latency))
@@ -0,0 +1,320 @@
+# benchmarks/run.py
+"""Benchmark suite for the scheduler tick, schedule CRUD, list reads and search.
+
+    python -m benchmarks.run                              # 1k, 10k and 100k schedules
+    python -m benchmarks.run --sizes 1000 --output HEAD.json
+    python -m benchmarks.run --output new.json --compare HEAD.json
+
+Each size gets a freshly seeded database in a scratch directory, and the
+run works inside that directory so its lock, status and log files never
+touch the real ones. YouTube is replaced by benchmarks.fake_youtube,
+so no network is used. Timings are wall-clock seconds over --repeat runs;
+peak memory is measured in a separate tracemalloc pass so tracing does not
+inflate the timings. Results are written as JSON for comparing commits.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time as time_module
+import tracemalloc
+from datetime import datetime
+
+from benchmarks import fake_youtube
+from benchmarks.seed import CATEGORIES, seed_database
+from database import connection
+from database.play_queue import play_queue
+from database.recurrence import describe_rule
+from database.schedule_db import (
+    add_schedule, check_schedule_once, count_schedules, delete_schedule, fire_due_schedules,
+    get_pending_runs, get_schedules, list_schedules, toggle_schedule, update_schedule
+)
+from database.snapshot import schedule_snapshot
+from database.videos import format_duration
+from database.youtube_urls import watch_url
+from youtube.search import search_cache, search_categories, search_videos
+from youtube.search_session import load_more
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_REPEAT = 20
+# 한 번 측정할 때 실행하는 CRUD 작업 수
+CRUD_BATCH = 50
+# 한 tick에 한꺼번에 재생 시각이 되는 스케줄 수
+BURST_SIZE = 100
+PAGE_SIZE = 20
+
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Benchmark:
+    """One measurement: run(state) is timed; setup(state) and teardown(state) run untimed around it"""
+
+    def __init__(self, name, run, setup=None, teardown=None, ops=1, memory=False):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+        self.ops = ops
+        self.memory = memory
+
+    def _once(self, state):
+        if self.setup:
+            self.setup(state)
+        started = time_module.perf_counter()
+        self.run(state)
+        elapsed = time_module.perf_counter() - started
+        if self.teardown:
+            self.teardown(state)
+        return elapsed
+
+    def measure(self, repeat):
+        state = {}
+        # 첫 실행은 문장 캐시 등을 채우는 용도로 버림
+        self._once(state)
+        result = summarize([self._once(state) for _ in range(repeat)], self.ops)
+        if self.memory:
+            tracemalloc.start()
+            try:
+                self._once(state)
+                result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        return result
+
+
+def summarize(timings, ops=1):
+    ordered = sorted(timings)
+    median = statistics.median(ordered)
+    return {
+        'runs': len(ordered),
+        'min': ordered[0],
+        'median': median,
+        'p95': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        'mean': statistics.fmean(ordered),
+        'ops_per_sec': ops / median if median else None,
+    }
+
+
+# --- 스냅샷/목록 조회 ---
+
+def _invalidate(state):
+    schedule_snapshot.invalidate()
+
+def _render_page(state):
+    # tab3이 한 페이지를 그릴 때 Streamlit 호출을 뺀 나머지 (조회 + 행별 표시 문자열)
+    total = count_schedules()
+    schedules, _ = list_schedules(limit=PAGE_SIZE)
+    for row in schedules:
+        describe_rule(row['recurrence'], row['schedule_time'])
+        format_duration(row.get('duration_seconds'))
+    return total
+
+def _middle_cursor(state):
+    schedule_snapshot.invalidate()
+    if 'middle' not in state:
+        schedules = get_schedules()
+        middle = schedules[len(schedules) // 2]
+        state['middle'] = (middle.schedule_time, middle.id)
+
+def _list_benchmarks():
+    return [
+        Benchmark('snapshot.get_schedules.cold', lambda state: get_schedules(), _invalidate, memory=True),
+        Benchmark('snapshot.get_schedules.warm', lambda state: get_schedules()),
+        Benchmark('engine.pending_runs', lambda state: get_pending_runs()),
+        Benchmark('list.render_page.cold', _render_page, _invalidate, memory=True),
+        Benchmark('list.render_page.warm', _render_page),
+        Benchmark('list.page_at_middle.cold', lambda state: list_schedules(after=state['middle'], limit=PAGE_SIZE),
+                  _middle_cursor),
+    ]
+
+
+# --- 스케줄러 tick ---
+
+def _make_due(state):
+    # 활성 YouTube 스케줄 BURST_SIZE개를 이번 tick에 재생 시각이 되도록 당김
+    # (fire_log는 회차별로 한 번만 재생하므로 회차 시각이 매번 달라야 함)
+    state['now'] = max(int(time_module.time()), state.get('now', 0) + 1)
+    with connection.transaction() as conn:
+        conn.execute("DELETE FROM play_queue")
+        conn.execute('''
+            UPDATE schedules SET next_run_at = ?
+            WHERE id IN (
+                SELECT id FROM schedules WHERE is_active = 1 AND file_type = 'youtube' ORDER BY id LIMIT ?
+            )
+        ''', (state['now'] - 1, BURST_SIZE))
+
+def _tick_benchmarks():
+    return [
+        Benchmark('tick.idle', lambda state: check_schedule_once()),
+        Benchmark(f'tick.burst{BURST_SIZE}', lambda state: fire_due_schedules(now=state['now']), _make_due,
+                  ops=BURST_SIZE, memory=True),
+    ]
+
+
+# --- CRUD ---
+
+def _new_batch(state):
+    state['batch'] = state.get('batch', 0) + 1
+    state['urls'] = [watch_url(fake_youtube.fake_video_id(f"crud{state['batch']}#{index}"))
+                     for index in range(CRUD_BATCH)]
+
+def _add(state):
+    for index, url in enumerate(state['urls']):
+        add_schedule(f"{index % 24:02d}:{index % 60:02d}", url, 'youtube', f"CRUD {index}", 'Music')
+    state['ids'] = [row[0] for row in connection.get_connection().execute(
+        "SELECT id FROM schedules ORDER BY id DESC LIMIT ?", (CRUD_BATCH,))]
+
+def _add_batch(state):
+    _new_batch(state)
+    _add(state)
+
+def _update(state):
+    for index, (schedule_id, url) in enumerate(zip(reversed(state['ids']), state['urls'])):
+        update_schedule(schedule_id, f"{(index + 1) % 24:02d}:{index % 60:02d}", url, 'youtube',
+                        f"CRUD {index} edited", 'News')
+
+def _toggle(state):
+    for schedule_id in state['ids']:
+        toggle_schedule(schedule_id, 0)
+        toggle_schedule(schedule_id, 1)
+
+def _delete(state):
+    # 측정 뒤에도 호출해 추가한 행을 지우고 데이터 크기를 유지
+    for schedule_id in state.pop('ids'):
+        delete_schedule(schedule_id)
+
+def _crud_benchmarks():
+    return [
+        Benchmark('crud.add', _add, _new_batch, _delete, ops=CRUD_BATCH),
+        Benchmark('crud.update', _update, _add_batch, _delete, ops=CRUD_BATCH),
+        Benchmark('crud.toggle', _toggle, _add_batch, _delete, ops=2 * CRUD_BATCH),
+        Benchmark('crud.delete', _delete, _add_batch, ops=CRUD_BATCH),
+    ]
+
+
+# --- 검색 ---
+
+# 검색 세션은 프로세스 전역이므로 크기가 바뀌어도 겹치지 않는 검색어를 사용
+_query_numbers = itertools.count(1)
+
+def _new_query(state):
+    state['query'] = next(_query_numbers)
+    search_cache.invalidate()
+
+def _search_benchmarks():
+    return [
+        Benchmark('search.miss', lambda state: search_videos(f"bench {state['query']}", 'Music'), _new_query,
+                  memory=True),
+        Benchmark('search.hit', lambda state: search_videos("bench warm", 'Music')),
+        Benchmark('search.categories', lambda state: list(search_categories(f"bench {state['query']}", CATEGORIES[:4])),
+                  _new_query),
+        Benchmark('search.load_more', lambda state: load_more(f"bench {state['query']}", 'Music', 0), _new_query),
+    ]
+
+
+def run_size(size, repeat, workdir, seed=0):
+    """Seed a database with size schedules in workdir and run every benchmark against it"""
+    path = os.path.join(workdir, f"schedule-{size}.db")
+    started = time_module.perf_counter()
+    seed_database(path, size, seed)
+    seed_seconds = time_module.perf_counter() - started
+    # 현재 분에 걸린 회차를 먼저 처리해 idle tick이 빈 tick이 되도록 함
+    check_schedule_once()
+    play_queue.clear()
+    results = {}
+    for benchmark in _list_benchmarks() + _tick_benchmarks() + _crud_benchmarks() + _search_benchmarks():
+        results[benchmark.name] = benchmark.measure(repeat)
+        print(f"  {size:>7} {benchmark.name:<30} median {results[benchmark.name]['median'] * 1000:9.2f} ms",
+              file=sys.stderr)
+    connection.close_connection()
+    return {
+        'seed_seconds': seed_seconds,
+        'db_bytes': os.path.getsize(path),
+        'benchmarks': results,
+    }
+
+def _git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=_REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=_REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+def run(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, workdir=None, seed=0, latency=0.0):
+    """Run the suite for each size and return the results dict"""
+    fake_youtube.install(latency)
+    meta = {
+        'commit': _git_commit(),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'seed': seed,
+        'search_latency': latency,
+    }
+    scratch = workdir or tempfile.mkdtemp(prefix='schedule-bench-')
+    os.makedirs(scratch, exist_ok=True)
+    previous_dir = os.getcwd()
+    os.chdir(scratch)
+    try:
+        sizes_results = {str(size): run_size(size, repeat, scratch, seed) for size in sizes}
+    finally:
+        os.chdir(previous_dir)
+        if workdir is None:
+            shutil.rmtree(scratch, ignore_errors=True)
+    return {'meta': meta, 'sizes': sizes_results}
+
+def compare(baseline, current):
+    """Lines comparing median timings of two result dicts (ratio > 1 means slower than baseline)"""
+    lines = [f"{'size':>7} {'benchmark':<30} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}"]
+    for size, size_results in current['sizes'].items():
+        base_results = baseline.get('sizes', {}).get(size, {}).get('benchmarks', {})
+        for name, result in size_results['benchmarks'].items():
+            base = base_results.get(name)
+            if base is None:
+                continue
+            ratio = result['median'] / base['median'] if base['median'] else float('inf')
+            lines.append(f"{size:>7} {name:<30} {base['median'] * 1000:12.2f} {result['median'] * 1000:12.2f} "
+                         f"{ratio:7.2f}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the video scheduler against synthetic databases")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="schedule counts to seed")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="timed runs per benchmark")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--search-latency', type=float, default=0.0,
+                        help="simulated seconds per fake YouTube result")
+    parser.add_argument('--workdir', help="keep the seeded databases in this directory")
+    parser.add_argument('--output', help="write the JSON results here instead of stdout")
+    parser.add_argument('--compare', metavar='BASELINE', help="print median ratios against an earlier results file")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.workdir and os.path.abspath(args.workdir), args.seed,
+                  args.search_latency)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print('\n'.join(compare(baseline, results)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/seed.py
+"""Synthetic schedule databases for benchmarks.
+
+    python -m benchmarks.seed 10000 bench-10k.db
+
+The mix of file types, categories and recurrence rules is fixed by the
+seed, so the same size always produces the same rows.
+"""
+import argparse
+import os
+import random
+
+from benchmarks.fake_youtube import fake_video_id
+from database import connection
+from database.schedule_db import add_schedules, init_db
+from database.youtube_urls import watch_url
+
+CATEGORIES = ('Music', 'News', 'Education', 'Entertainment', 'Sports', 'Kids')
+# (반복 규칙, 비율) - 대부분 매일, 나머지는 요일/간격/cron/날짜 규칙
+RECURRENCES = (
+    ('daily', 60),
+    ('weekdays:0,1,2,3,4', 15),
+    ('weekdays:5,6', 5),
+    ('every:30', 8),
+    ('cron:*/15 9-17 * * 1-5', 7),
+    ('date:2030-01-01', 5),
+)
+# (파일 유형, 비율)
+FILE_TYPES = (('youtube', 80), ('local', 15), ('html', 5))
+INACTIVE_RATIO = 0.1
+SEED_CHUNK_SIZE = 5000
+
+
+def synthetic_schedules(count, seed=0):
+    """Yield count add_schedules tuples"""
+    rng = random.Random(seed)
+    recurrences, recurrence_weights = zip(*RECURRENCES)
+    file_types, file_type_weights = zip(*FILE_TYPES)
+    for index in range(count):
+        schedule_time = f"{rng.randrange(24):02d}:{rng.randrange(60):02d}"
+        file_type = rng.choices(file_types, file_type_weights)[0]
+        video_id = None
+        if file_type == 'youtube':
+            video_id = fake_video_id(f"seed{seed}#{index}")
+            file_path = watch_url(video_id)
+        elif file_type == 'local':
+            file_path = os.path.join('videos', f"clip_{index:06d}.mp4")
+        else:
+            file_path = os.path.join('pages', f"page_{index:06d}.html")
+        yield (schedule_time, file_path, file_type, f"Benchmark video {index}", rng.choice(CATEGORIES),
+               rng.choices(recurrences, recurrence_weights)[0], 0 if rng.random() < INACTIVE_RATIO else 1,
+               video_id)
+
+def seed_database(path, count, seed=0):
+    """Create (or extend) the database at path with count synthetic schedules; returns rows inserted"""
+    connection.set_db_path(path)
+    init_db()
+    inserted = 0
+    chunk = []
+    for schedule in synthetic_schedules(count, seed):
+        chunk.append(schedule)
+        if len(chunk) >= SEED_CHUNK_SIZE:
+            inserted += add_schedules(chunk)
+            chunk = []
+    inserted += add_schedules(chunk)
+    return inserted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create a synthetic schedule database")
+    parser.add_argument('count', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    inserted = seed_database(args.path, args.count, args.seed)
+    print(f"Seeded {inserted} schedules into {args.path}")
+
+
+if __name__ == '__main__':
+    main()
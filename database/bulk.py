@@ -0,0 +1,253 @@
+# database/bulk.py
+"""Bulk schedule import/export.
+
+    python -m database.bulk import schedules.csv
+    python -m database.bulk export schedules.json
+
+Files are read and written as streams, so memory stays bounded no matter
+how many rows they hold. Imported rows are validated one by one; valid
+rows are inserted in chunks of IMPORT_CHUNK_SIZE, one transaction per
+chunk, and invalid rows are reported with their row number.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from database import connection
+from database.connection import get_connection
+from database.recurrence import DEFAULT_RULE, validate_rule
+from database.schedule_db import add_schedules, init_db
+from database.videos import extract_youtube_id
+
+# 한 트랜잭션에 넣을 행 수
+IMPORT_CHUNK_SIZE = 1000
+# 보고서에 보관할 최대 오류 수 (전체 개수는 따로 셈)
+MAX_REPORTED_ERRORS = 1000
+# JSON 배열을 나눠 읽는 크기
+READ_CHUNK_SIZE = 64 * 1024
+
+FILE_TYPES = ('youtube', 'local', 'html')
+EXPORT_FIELDS = ('schedule_time', 'file_path', 'file_type', 'title', 'category', 'recurrence', 'is_active')
+FORMATS = ('csv', 'json')
+
+
+class ImportReport:
+    """Counts of an import plus the first MAX_REPORTED_ERRORS (row_number, message) errors.
+
+    Active rows that repeat a video already scheduled to fire at the same
+    moments are counted in duplicates rather than as errors.
+    """
+
+    def __init__(self):
+        self.imported = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row_number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row_number, message))
+
+    def __repr__(self):
+        return f"ImportReport(imported={self.imported}, duplicates={self.duplicates}, failed={self.failed})"
+
+    def add_chunk(self, chunk):
+        inserted = add_schedules(chunk)
+        self.imported += inserted
+        # 같은 비디오가 같은 순간에 이미 예약되어 있으면 건너뜀 (유일 인덱스)
+        self.duplicates += len(chunk) - inserted
+
+
+def detect_format(filename):
+    """'csv' or 'json' from a file name (.json and .jsonl are both json)"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.json', '.jsonl'):
+        return 'json'
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {filename} (csv, json, jsonl)")
+
+# CSV 행을 (줄 번호, dict)로 하나씩 읽음
+def iter_csv_rows(file):
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, row
+
+# JSON 배열 또는 JSON Lines를 (항목 번호, 값)으로 하나씩 읽음
+def iter_json_rows(file):
+    buffer = file.read(READ_CHUNK_SIZE).lstrip()
+    if buffer.startswith('['):
+        yield from _iter_json_array(buffer[1:], file)
+        return
+    # JSON Lines - 한 줄에 객체 하나, 깨진 줄은 그 줄만 오류로 보고
+    for number, line in enumerate(_iter_lines(buffer, file), 1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, e
+
+def _iter_lines(pending, file):
+    # 이미 읽은 조각에 이어서 나머지 파일을 줄 단위로 읽음
+    while True:
+        lines = pending.split('\n')
+        pending = lines.pop()
+        yield from lines
+        chunk = file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        pending += chunk
+    if pending:
+        yield pending
+
+def _iter_json_array(buffer, file):
+    decoder = json.JSONDecoder()
+    eof = False
+    number = 0
+    while True:
+        buffer = buffer.lstrip()
+        if buffer.startswith(','):
+            buffer = buffer[1:]
+            continue
+        if buffer.startswith(']'):
+            return
+        try:
+            value, end = decoder.raw_decode(buffer)
+            # 값이 조각 끝에서 끝났다면 잘린 숫자일 수 있으므로 더 읽고 다시 해석
+            if end == len(buffer) and not eof:
+                raise json.JSONDecodeError("incomplete", buffer, end)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = file.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+        number += 1
+        yield number, value
+        buffer = buffer[end:]
+
+def _is_active(value):
+    if value is None or value == '':
+        return 1
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ('1', 'true', 'yes', 'y', 'on'):
+            return 1
+        if value in ('0', 'false', 'no', 'n', 'off'):
+            return 0
+        raise ValueError(f"is_active 값을 알 수 없습니다: {value}")
+    return 1 if value else 0
+
+def parse_row(row):
+    """Validate one imported row and return the tuple add_schedules expects (raises ValueError)"""
+    if not isinstance(row, dict):
+        raise ValueError("각 항목은 객체여야 합니다")
+
+    def field(name):
+        value = row.get(name)
+        return str(value).strip() if value is not None else ''
+
+    schedule_time = field('schedule_time')
+    file_path = field('file_path') or field('url')
+    title = field('title')
+    if not schedule_time or not file_path or not title:
+        raise ValueError("schedule_time, file_path, title은 필수입니다")
+
+    video_id = extract_youtube_id(file_path)
+    file_type = field('file_type') or ('youtube' if video_id else 'local')
+    if file_type not in FILE_TYPES:
+        raise ValueError(f"알 수 없는 파일 유형입니다: {file_type}")
+    if file_type == 'youtube' and not video_id:
+        raise ValueError(f"유효한 YouTube URL이 아닙니다: {file_path}")
+    if file_type != 'youtube':
+        video_id = None
+
+    recurrence = field('recurrence') or DEFAULT_RULE
+    validate_rule(recurrence, schedule_time)
+    return (schedule_time, file_path, file_type, title, field('category') or 'Music', recurrence,
+            _is_active(row.get('is_active')), video_id)
+
+def import_schedules(file, fmt, chunk_size=IMPORT_CHUNK_SIZE):
+    """Import schedules from a text stream in 'csv' or 'json' format and return an ImportReport"""
+    rows = iter_csv_rows(file) if fmt == 'csv' else iter_json_rows(file)
+    report = ImportReport()
+    chunk = []
+    try:
+        for row_number, row in rows:
+            if isinstance(row, ValueError):
+                report.add_error(row_number, f"JSON 형식 오류: {row}")
+                continue
+            try:
+                chunk.append(parse_row(row))
+            except ValueError as e:
+                report.add_error(row_number, str(e))
+                continue
+            if len(chunk) >= chunk_size:
+                report.add_chunk(chunk)
+                chunk = []
+    except (ValueError, csv.Error) as e:
+        # 파일 자체가 깨진 경우 - 그 전까지 읽은 행은 유지
+        report.add_error(None, f"파일을 읽을 수 없습니다: {e}")
+    report.add_chunk(chunk)
+    return report
+
+def export_schedules(file, fmt):
+    """Write every schedule to a text stream in 'csv' or 'json' format and return the row count"""
+    cursor = get_connection().execute(
+        f"SELECT {', '.join(EXPORT_FIELDS)} FROM schedules ORDER BY schedule_time, id")
+    count = 0
+    if fmt == 'csv':
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_FIELDS)
+        for row in cursor:
+            writer.writerow(row)
+            count += 1
+        return count
+    file.write('[')
+    for row in cursor:
+        file.write(',\n' if count else '\n')
+        json.dump(dict(zip(EXPORT_FIELDS, row)), file, ensure_ascii=False)
+        count += 1
+    file.write('\n]\n')
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import or export video schedules in bulk")
+    parser.add_argument('--db', default=connection.DB_PATH, help="schedule database file")
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help="add schedules from a CSV/JSON/JSON Lines file")
+    import_parser.add_argument('path')
+    import_parser.add_argument('--format', choices=FORMATS)
+    import_parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+    export_parser = commands.add_parser('export', help="write every schedule to a CSV/JSON file ('-' for stdout)")
+    export_parser.add_argument('path')
+    export_parser.add_argument('--format', choices=FORMATS)
+    args = parser.parse_args(argv)
+
+    connection.set_db_path(args.db)
+    init_db()
+    fmt = args.format or (detect_format(args.path) if args.path != '-' else 'json')
+    if args.command == 'import':
+        with open(args.path, 'r', encoding='utf-8-sig', newline='') as f:
+            report = import_schedules(f, fmt, args.chunk_size)
+        for row_number, message in report.errors:
+            print(f"row {row_number}: {message}", file=sys.stderr)
+        print(f"Imported {report.imported} schedules, skipped {report.duplicates} duplicates, {report.failed} rows failed")
+        return 1 if report.failed else 0
+    if args.path == '-':
+        count = export_schedules(sys.stdout, fmt)
+    else:
+        with open(args.path, 'w', encoding='utf-8', newline='') as f:
+            count = export_schedules(f, fmt)
+    print(f"Exported {count} schedules", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# database/connection.py
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# 기본 데이터베이스 파일 (벤치마크/테스트에서는 set_db_path로 변경)
+DB_PATH = 'schedule.db'
+
+# 잠금 대기 시간 (초) - 스케줄러 쓰기와 UI 읽기가 겹칠 때 바로 실패하지 않도록
+BUSY_TIMEOUT = 5.0
+
+# 연결별로 캐시할 prepared statement 수
+CACHED_STATEMENTS = 256
+
+# 연결 설정 PRAGMA
+# WAL: 읽기와 쓰기가 서로를 막지 않음
+# synchronous=NORMAL: WAL 모드에서 안전하면서 커밋마다 fsync하지 않음
+# cache_size 음수 = KiB 단위 (약 16MB)
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA foreign_keys = ON",
+    f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}",
+)
+
+# 끝난 스레드에서 회수해 다시 쓸 유휴 연결 수 (경로별) - Streamlit은 rerun마다 새 스레드에서 실행됨
+POOL_SIZE = 4
+
+_local = threading.local()
+_pool_lock = threading.Lock()
+_checked_out = {}  # path -> [(thread, conn)]
+_idle = {}  # path -> [conn]
+
+def set_db_path(path):
+    """Point every subsequent connection at another database file"""
+    global DB_PATH
+    DB_PATH = path
+
+def sidecar_path(suffix):
+    """Path of a file kept next to the current database, e.g. '.lock' -> /data/schedule.db.lock"""
+    return os.path.abspath(DB_PATH) + suffix
+
+def open_connection(path=None, check_same_thread=True):
+    """Open a new dedicated connection with the standard pragmas (caller closes it)"""
+    conn = sqlite3.connect(
+        path or DB_PATH,
+        timeout=BUSY_TIMEOUT,
+        isolation_level=None,
+        cached_statements=CACHED_STATEMENTS,
+        check_same_thread=check_same_thread,
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def _reclaim(path):
+    # 끝난 스레드가 쓰던 연결을 유휴 목록으로 (_pool_lock 안에서 호출)
+    idle = _idle.setdefault(path, [])
+    alive = []
+    for thread, conn in _checked_out.get(path, ()):
+        if thread.is_alive():
+            alive.append((thread, conn))
+        elif len(idle) < POOL_SIZE:
+            idle.append(conn)
+        else:
+            conn.close()
+    _checked_out[path] = alive
+    return idle
+
+def _check_out(path):
+    thread = threading.current_thread()
+    with _pool_lock:
+        idle = _reclaim(path)
+        conn = idle.pop() if idle else None
+        if conn is None:
+            conn = open_connection(path, check_same_thread=False)
+        _checked_out[path].append((thread, conn))
+    if conn.in_transaction:
+        # 트랜잭션 도중 끝난 스레드의 연결
+        conn.execute("ROLLBACK")
+    return conn
+
+def get_connection():
+    """Return this thread's reusable connection to DB_PATH.
+
+    A thread keeps the same connection for its lifetime. Connections of
+    threads that have ended go back to a small process-wide pool and are
+    handed to the next new thread, so short-lived threads (a Streamlit
+    rerun each) do not open a connection and rerun the PRAGMAs every time.
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(DB_PATH)
+    if conn is None:
+        conn = connections[DB_PATH] = _check_out(DB_PATH)
+    return conn
+
+def close_connection():
+    """Close every connection used by the calling thread"""
+    connections = getattr(_local, 'connections', None) or {}
+    with _pool_lock:
+        for path, conn in connections.items():
+            _checked_out[path] = [entry for entry in _checked_out.get(path, ()) if entry[1] is not conn]
+            conn.close()
+    connections.clear()
+
+@contextmanager
+def transaction():
+    """Run a block in one write transaction on this thread's connection.
+
+    BEGIN IMMEDIATE takes the write lock up front, so a concurrent writer
+    waits on the busy timeout instead of failing with a deadlock error
+    halfway through the block.
+    """
+    conn = get_connection()
+    if conn.in_transaction:
+        # 중첩 호출은 바깥 트랜잭션에 합류
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
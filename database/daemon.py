@@ -0,0 +1,131 @@
+# database/daemon.py
+"""Headless scheduler daemon.
+
+    python -m database.daemon [--db schedule.db]
+
+Runs the schedule engine without Streamlit, pandas or scrapetube. The
+Streamlit UI becomes an optional client: while the daemon holds the
+scheduler lock the UI stays in standby and only edits the database, and
+the engine picks up its changes at once through the wake channel (or,
+failing that, the schedules data version).
+"""
+import argparse
+import logging
+import signal
+import threading
+import time as time_module
+from datetime import datetime
+
+from database import connection
+from database.schedule_db import init_db
+from database.scheduler import start_scheduler, stop_scheduler
+from database.state_store import JsonStateStore
+from monitoring.logs import configure_logging
+from monitoring.metrics import metrics, serve as serve_metrics
+
+# python -m으로 실행하면 __name__이 '__main__'이 되므로 이름을 직접 지정
+logger = logging.getLogger('database.daemon')
+
+# 데몬 상태 파일 (UI가 읽어서 표시) - 데이터베이스 파일 경로 + 접미사
+STATUS_SUFFIX = '.status.json'
+# 상태 파일 갱신 주기 (초) - 잠금을 다른 프로세스가 가진 경우 이 주기로 다시 시도
+HEARTBEAT_SECONDS = 10
+# 이 시간보다 오래 갱신되지 않은 상태 파일은 무시 (초)
+STATUS_STALE_SECONDS = 3 * HEARTBEAT_SECONDS
+# Prometheus textfile collector용 지표 파일 (하트비트마다 갱신) - 데이터베이스 파일 경로 + 접미사
+METRICS_SUFFIX = '.metrics.prom'
+
+_status_stores = {}
+
+def _store(path=None):
+    # 경로를 주지 않으면 현재 데이터베이스 옆의 상태 파일
+    path = path or connection.sidecar_path(STATUS_SUFFIX)
+    store = _status_stores.get(path)
+    if store is None:
+        store = _status_stores[path] = JsonStateStore(path)
+    return store
+
+def write_status(status, path=None):
+    """Atomically write the daemon status so readers never see a partial file"""
+    _store(path).write(dict(status, updated_at=datetime.now().isoformat()))
+
+def read_status(path=None, max_age=STATUS_STALE_SECONDS):
+    """Return the daemon status, or None if no daemon has reported recently"""
+    store = _store(path)
+    modified_at = store.modified_at()
+    if modified_at is None or time_module.time() - modified_at > max_age:
+        return None
+    return store.read()
+
+def _remove_status(path=None):
+    try:
+        _store(path).clear()
+    except OSError:
+        pass
+
+def run(heartbeat=HEARTBEAT_SECONDS, status_path=None, metrics_path=None):
+    """Run the scheduler until SIGINT/SIGTERM, refreshing the status and metrics files every heartbeat.
+
+    Both files default to the database path plus STATUS_SUFFIX and
+    METRICS_SUFFIX; an empty metrics_path disables the metrics file.
+    """
+    stopping = threading.Event()
+    status_path = status_path or connection.sidecar_path(STATUS_SUFFIX)
+    if metrics_path is None:
+        metrics_path = connection.sidecar_path(METRICS_SUFFIX)
+
+    def handle_signal(signum, frame):
+        logger.info("Received signal %s, stopping scheduler", signum)
+        stopping.set()
+
+    for name in ('SIGINT', 'SIGTERM', 'SIGBREAK'):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), handle_signal)
+
+    init_db()
+    last_state = None
+    try:
+        while True:
+            # 이미 실행 중이면 바로 반환, 다른 프로세스가 잠금을 놓으면 이어받음
+            status = start_scheduler()
+            if status['state'] != last_state:
+                logger.info("Scheduler %s (pid %s, db %s)", status['state'], status['pid'], connection.DB_PATH)
+                last_state = status['state']
+            if status['state'] == 'running':
+                # UI 사이드바는 상태 파일의 지표 스냅샷을 표시
+                write_status(dict(status, metrics=metrics.snapshot()), status_path)
+                if metrics_path:
+                    try:
+                        metrics.write_textfile(metrics_path)
+                    except OSError as e:
+                        logger.warning("Metrics file write error: %s", e)
+            if stopping.wait(heartbeat):
+                break
+    finally:
+        stop_scheduler()
+        if last_state == 'running':
+            _remove_status(status_path)
+    logger.info("Scheduler stopped")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the video scheduler without the Streamlit UI")
+    parser.add_argument('--db', default=connection.DB_PATH, help="schedule database file")
+    parser.add_argument('--heartbeat', type=float, default=HEARTBEAT_SECONDS,
+                        help="seconds between status file updates")
+    parser.add_argument('--metrics-file',
+                        help="Prometheus text file rewritten every heartbeat "
+                             f"(default: the database path + {METRICS_SUFFIX}, '' to disable)")
+    parser.add_argument('--metrics-port', type=int,
+                        help="also serve metrics at http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--log-level', default='INFO', choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'),
+                        help="minimum level written to logs/daemon.log and the console")
+    args = parser.parse_args(argv)
+    configure_logging('daemon', args.log_level)
+    connection.set_db_path(args.db)
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    run(args.heartbeat, metrics_path=args.metrics_file)
+
+
+if __name__ == '__main__':
+    main()
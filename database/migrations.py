@@ -0,0 +1,314 @@
+# database/migrations.py
+import logging
+
+from database.connection import get_connection, transaction
+from database.recurrence import fire_key, next_fire_time
+from database.videos import extract_youtube_id
+
+logger = logging.getLogger(__name__)
+
+# (버전, 설명, 함수) 목록 - 버전 순서대로 한 번씩만 적용
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register a schema migration applied once when user_version < version"""
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return func
+    return register
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate():
+    """Apply every pending migration in order and return the resulting schema version"""
+    # 이미 최신이면 쓰기 잠금 없이 읽기 한 번으로 끝 (UI rerun과 데몬 시작마다 호출됨)
+    version = schema_version(get_connection())
+    if MIGRATIONS and version >= MIGRATIONS[-1][0]:
+        return version
+    for target, description, func in MIGRATIONS:
+        # 버전 확인과 적용을 같은 쓰기 트랜잭션에서 수행 (여러 프로세스가 동시에 시작해도 한 번만 적용)
+        with transaction() as conn:
+            version = schema_version(conn)
+            if version >= target:
+                continue
+            func(conn)
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+            version = target
+    return version
+
+
+@migration(1, "schedules 테이블 생성 및 last_played/category 컬럼 보강")
+def _create_schedules(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            schedule_time TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            file_type TEXT NOT NULL,
+            title TEXT,
+            category TEXT DEFAULT 'Music',
+            is_active INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_played TEXT DEFAULT NULL
+        )
+    ''')
+    # 이전 버전 데이터베이스 (video_schedule.db 등)에 없는 컬럼 추가
+    columns = _columns(conn, 'schedules')
+    if 'last_played' not in columns:
+        conn.execute("ALTER TABLE schedules ADD COLUMN last_played TEXT DEFAULT NULL")
+    if 'category' not in columns:
+        conn.execute("ALTER TABLE schedules ADD COLUMN category TEXT DEFAULT 'Music'")
+
+
+@migration(2, "활성 스케줄 재생 시각 부분 인덱스")
+def _index_active_schedules(conn):
+    # 스케줄러 조회 (schedule_time = ? AND is_active = 1)를 인덱스 탐색 한 번으로 처리
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_schedules_active_time
+        ON schedules (schedule_time) WHERE is_active = 1
+    ''')
+
+
+@migration(3, "정수 epoch next_run_at 컬럼과 재생 예정 인덱스")
+def _add_next_run_at(conn):
+    if 'next_run_at' not in _columns(conn, 'schedules'):
+        conn.execute("ALTER TABLE schedules ADD COLUMN next_run_at INTEGER DEFAULT NULL")
+    rows = conn.execute("SELECT id, schedule_time FROM schedules").fetchall()
+    conn.executemany(
+        "UPDATE schedules SET next_run_at = ? WHERE id = ?",
+        [(next_fire_time(schedule_time), schedule_id) for schedule_id, schedule_time in rows],
+    )
+    # 스케줄러 조회 (is_active = 1 AND next_run_at <= ?)는 범위 탐색 한 번으로 처리
+    conn.execute("DROP INDEX IF EXISTS idx_schedules_active_time")
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_schedules_next_run
+        ON schedules (next_run_at) WHERE is_active = 1
+    ''')
+
+
+@migration(4, "반복 규칙 recurrence 컬럼")
+def _add_recurrence(conn):
+    if 'recurrence' not in _columns(conn, 'schedules'):
+        conn.execute("ALTER TABLE schedules ADD COLUMN recurrence TEXT NOT NULL DEFAULT 'daily'")
+
+
+@migration(5, "YouTube 검색 결과 영구 캐시")
+def _create_search_cache(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS search_cache (
+            cache_key TEXT PRIMARY KEY,
+            results TEXT NOT NULL,
+            fetched_at INTEGER NOT NULL
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_fetched ON search_cache (fetched_at)")
+
+
+@migration(6, "videos 메타데이터 테이블과 schedules.video_id 외래 키")
+def _create_videos(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS videos (
+            video_id TEXT PRIMARY KEY,
+            title TEXT,
+            channel TEXT,
+            duration_seconds INTEGER,
+            view_count_text TEXT,
+            view_count INTEGER,
+            updated_at INTEGER
+        )
+    ''')
+    if 'video_id' not in _columns(conn, 'schedules'):
+        conn.execute("ALTER TABLE schedules ADD COLUMN video_id TEXT REFERENCES videos (video_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_schedules_video ON schedules (video_id)")
+    
+    # 기존 YouTube 스케줄의 video_id 채우기
+    rows = conn.execute("SELECT id, file_path, title FROM schedules WHERE file_type = 'youtube'").fetchall()
+    linked = [(extract_youtube_id(file_path), title, schedule_id) for schedule_id, file_path, title in rows]
+    linked = [row for row in linked if row[0]]
+    conn.executemany("INSERT OR IGNORE INTO videos (video_id, title) VALUES (?, ?)",
+                     [(video_id, title) for video_id, title, _ in linked])
+    conn.executemany("UPDATE schedules SET video_id = ? WHERE id = ?",
+                     [(video_id, schedule_id) for video_id, _, schedule_id in linked])
+
+
+@migration(7, "스케줄 목록 keyset 페이지 인덱스")
+def _index_schedule_list(conn):
+    # ORDER BY schedule_time, id + (schedule_time, id) > (?, ?) 페이지 조회용
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_schedules_time_id ON schedules (schedule_time, id)")
+    # 카테고리 필터가 있을 때도 정렬 순서대로 인덱스를 따라감
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_schedules_category_time ON schedules (category, schedule_time, id)")
+
+
+@migration(8, "현재 재생 중인 비디오 now_playing 행")
+def _create_now_playing(conn):
+    # 항상 최대 한 행 (id = 1) - 프로세스 간 현재 재생 비디오 공유
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS now_playing (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            file_path TEXT NOT NULL,
+            title TEXT,
+            timestamp TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 1
+        )
+    ''')
+
+
+@migration(9, "재생 대기열 play_queue와 now_playing.ends_at")
+def _create_play_queue(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS play_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT NOT NULL,
+            title TEXT,
+            priority INTEGER NOT NULL DEFAULT 0,
+            scheduled_at INTEGER NOT NULL,
+            duration_seconds INTEGER,
+            schedule_id INTEGER
+        )
+    ''')
+    # 다음 재생 항목 조회 (ORDER BY ... LIMIT 1)가 인덱스 한 번 탐색으로 끝나도록
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_play_queue_order ON play_queue (priority DESC, scheduled_at, id)")
+    if 'ends_at' not in _columns(conn, 'now_playing'):
+        conn.execute("ALTER TABLE now_playing ADD COLUMN ends_at INTEGER")
+
+
+@migration(10, "회차별 재생 기록 fire_log")
+def _create_fire_log(conn):
+    # (schedule_id, occurrence) 유일 키 - 같은 회차는 한 번만 기록/재생
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS fire_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            schedule_id INTEGER NOT NULL,
+            occurrence INTEGER NOT NULL,
+            fired_at INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            UNIQUE (schedule_id, occurrence)
+        )
+    ''')
+
+
+@migration(11, "video_id 공용 파서로 재계산")
+def _recompute_video_ids(conn):
+    # 이전 정규식이 놓친 형식 (shorts, live, nocookie 등) 포함해 video_id 다시 계산
+    rows = conn.execute("SELECT id, file_path, title, video_id FROM schedules WHERE file_type = 'youtube'").fetchall()
+    changed = [(extract_youtube_id(file_path), title, schedule_id, video_id)
+               for schedule_id, file_path, title, video_id in rows]
+    changed = [row for row in changed if row[0] != row[3]]
+    conn.executemany("INSERT OR IGNORE INTO videos (video_id, title) VALUES (?, ?)",
+                     [(video_id, title) for video_id, title, _, _ in changed if video_id])
+    conn.executemany("UPDATE schedules SET video_id = ? WHERE id = ?",
+                     [(video_id, schedule_id) for video_id, _, schedule_id, _ in changed])
+
+
+@migration(12, "정규화한 재생 규칙 fire_key 컬럼과 활성 스케줄 중복 방지 인덱스")
+def _unique_video_fire_key(conn):
+    if 'fire_key' not in _columns(conn, 'schedules'):
+        conn.execute("ALTER TABLE schedules ADD COLUMN fire_key TEXT")
+    rows = conn.execute("SELECT id, schedule_time, recurrence FROM schedules").fetchall()
+    conn.executemany("UPDATE schedules SET fire_key = ? WHERE id = ?",
+                     [(_fire_key_or_raw(recurrence, schedule_time), schedule_id)
+                      for schedule_id, schedule_time, recurrence in rows])
+    # 이전 버전 11번 마이그레이션이 만든 (video_id, schedule_time) 인덱스는 반복 규칙을 무시했음
+    conn.execute("DROP INDEX IF EXISTS idx_schedules_video_time")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_schedules_video ON schedules (video_id)")
+
+    # 같은 비디오를 같은 순간에 재생하는 활성 스케줄은 먼저 만든 하나만 남기고 비활성화 (삭제하지 않음)
+    deactivated = conn.execute('''
+        UPDATE schedules SET is_active = 0 WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY video_id, fire_key ORDER BY id) AS duplicate
+                FROM schedules
+                WHERE video_id IS NOT NULL AND is_active = 1
+            )
+            WHERE duplicate > 1
+        )
+    ''').rowcount
+    if deactivated:
+        logger.warning("Deactivated %d duplicate schedules (same video at the same moments)", deactivated)
+    # 비활성 스케줄은 겹쳐도 됨 - 다시 활성화할 때 검사
+    conn.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_schedules_video_fire
+        ON schedules (video_id, fire_key) WHERE video_id IS NOT NULL AND is_active = 1
+    ''')
+
+def _fire_key_or_raw(recurrence, schedule_time):
+    # 해석할 수 없는 이전 데이터는 원래 문자열 그대로 사용
+    try:
+        return fire_key(recurrence, schedule_time)
+    except (AttributeError, TypeError, ValueError):
+        return f"{recurrence} {schedule_time}"
+
+
+# 스냅샷이 구분해서 캐시하는 데이터 - 다른 테이블(검색 캐시, 재생 기록 등)에 쓰면 버전이 바뀌지 않음
+VERSIONED_DATA = ('schedules', 'now_playing', 'play_queue')
+
+@migration(13, "데이터별 변경 버전 data_versions와 갱신 트리거")
+def _create_data_versions(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.executemany("INSERT OR IGNORE INTO data_versions (name) VALUES (?)", [(name,) for name in VERSIONED_DATA])
+    for table in VERSIONED_DATA:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version AFTER {event} ON {table}
+                BEGIN
+                    UPDATE data_versions SET version = version + 1 WHERE name = '{table}';
+                END
+            ''')
+    # 스케줄 목록에 조인해서 보여주는 메타데이터가 바뀐 경우도 스케줄 변경으로 취급 (예약된 비디오만)
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS videos_update_version
+        AFTER UPDATE OF channel, duration_seconds, view_count_text ON videos
+        WHEN (OLD.channel IS NOT NEW.channel OR OLD.duration_seconds IS NOT NEW.duration_seconds
+              OR OLD.view_count_text IS NOT NEW.view_count_text)
+             AND EXISTS (SELECT 1 FROM schedules WHERE video_id = NEW.video_id)
+        BEGIN
+            UPDATE data_versions SET version = version + 1 WHERE name = 'schedules';
+        END
+    ''')
+
+
+@migration(14, "now_playing 재생 시작 시각과 재생 시간")
+def _add_now_playing_start(conn):
+    # 재생 시간을 모르는 비디오는 시작 뒤에 예약 시각이 된 대기열 항목이 바로 이어받음
+    columns = _columns(conn, 'now_playing')
+    if 'started_at' not in columns:
+        conn.execute("ALTER TABLE now_playing ADD COLUMN started_at INTEGER")
+    if 'duration_seconds' not in columns:
+        conn.execute("ALTER TABLE now_playing ADD COLUMN duration_seconds INTEGER")
+
+
+@migration(15, "fire_log 보존 기간 정리용 인덱스")
+def _index_fire_log_fired_at(conn):
+    # 틱마다 오래된 기록을 지울 때 범위 조회로 끝나도록
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_fire_log_fired_at ON fire_log (fired_at)")
+
+
+@migration(16, "검색 세션 이어받기 위치 search_sessions")
+def _create_search_sessions(conn):
+    # 캐시된 검색에서 "더 보기"를 누르면 첫 페이지를 다시 가져오지 않고 저장된 위치부터 이어서 가져옴
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS search_sessions (
+            session_key TEXT PRIMARY KEY,
+            position INTEGER NOT NULL,
+            seen TEXT NOT NULL,
+            continuation TEXT,
+            updated_at INTEGER NOT NULL
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_search_sessions_updated ON search_sessions (updated_at)")
+
+
+@migration(17, "play_queue 예약 시각 인덱스")
+def _index_play_queue_scheduled_at(conn):
+    # 재생 시간을 모르는 비디오를 이어받을 항목이 있는지 (scheduled_at > 시작 시각) 전체 스캔 없이 확인
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_play_queue_scheduled_at ON play_queue (scheduled_at)")
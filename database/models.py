@@ -0,0 +1,61 @@
+# database/models.py
+
+class Schedule:
+    """One schedules row (optionally joined with its videos metadata).
+
+    Fields are looked up by column name, never by position, so adding
+    columns or reading an older database with a different column order is
+    safe. Supports both ``schedule.title`` and ``schedule['title']``.
+    """
+
+    __slots__ = (
+        'id', 'schedule_time', 'file_path', 'file_type', 'title', 'category',
+        'is_active', 'created_at', 'last_played', 'next_run_at', 'recurrence', 'video_id',
+        'channel', 'duration_seconds', 'view_count_text',
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def get(self, name, default=None):
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"Schedule(id={self.id!r}, schedule_time={self.schedule_time!r}, title={self.title!r})"
+
+
+# 커서 컬럼 구성별 (슬롯 이름, 컬럼 위치) 매핑 캐시
+_column_maps = {}
+
+def schedule_factory(cursor, row):
+    """sqlite3 row factory that builds Schedule records from any column order"""
+    description = cursor.description
+    key = tuple(column[0] for column in description)
+    mapping = _column_maps.get(key)
+    if mapping is None:
+        slots = set(Schedule.__slots__)
+        mapping = _column_maps[key] = tuple(
+            (name, index) for index, name in enumerate(key) if name in slots
+        )
+    schedule = Schedule.__new__(Schedule)
+    for name in Schedule.__slots__:
+        setattr(schedule, name, None)
+    for name, index in mapping:
+        setattr(schedule, name, row[index])
+    return schedule
+
+def schedules_to_dataframe(schedules):
+    """Export Schedule records as a pandas DataFrame (pandas is imported only here)"""
+    import pandas as pd
+    return pd.DataFrame([schedule.as_dict() for schedule in schedules], columns=list(Schedule.__slots__))
@@ -0,0 +1,66 @@
+# database/now_playing.py
+import time as time_module
+from datetime import datetime
+
+from database.connection import transaction
+from database.snapshot import schedule_snapshot
+
+# Streamlit 플레이어 fragment 갱신 주기 (초) - 갱신할 때마다 PRAGMA data_version만 확인
+REFRESH_SECONDS = 2
+# 재생 시간을 모르는 비디오를 재생 중으로 간주하는 시간 (초) - 같은 순간에 예약된 다음 항목은 이후에 재생
+# (그 뒤에 예약 시각이 된 항목은 기다리지 않고 바로 교체)
+DEFAULT_PLAY_SECONDS = 10 * 60
+
+
+class NowPlayingChannel:
+    """Publishes the video that should be playing to every process and session.
+
+    The value lives in the single-row now_playing table, so the scheduler
+    daemon, the scheduler thread and any number of UI processes share it.
+    Reads go through the shared snapshot and only hit the table after the
+    now_playing data version changes.
+    """
+
+    def publish(self, file_path, title, duration_seconds=None):
+        """Make file_path the current video.
+
+        The video counts as playing for duration_seconds. When that is
+        unknown it holds the play queue for DEFAULT_PLAY_SECONDS only
+        against entries that were already due when it started; see
+        PlayQueue.advance.
+        """
+        now = time_module.time()
+        video = {
+            'file_path': file_path,
+            'title': title,
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+            'ends_at': int(now + (duration_seconds or DEFAULT_PLAY_SECONDS)),
+        }
+        with transaction() as conn:
+            conn.execute('''
+                INSERT INTO now_playing (id, file_path, title, timestamp, ends_at, started_at, duration_seconds)
+                VALUES (1, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    file_path = excluded.file_path, title = excluded.title, timestamp = excluded.timestamp,
+                    ends_at = excluded.ends_at, started_at = excluded.started_at,
+                    duration_seconds = excluded.duration_seconds, version = version + 1
+            ''', (file_path, title, video['timestamp'], video['ends_at'], int(now), duration_seconds or None))
+        return video
+
+    def clear(self):
+        with transaction() as conn:
+            conn.execute("DELETE FROM now_playing")
+
+    def current(self):
+        """The current video as {'file_path', 'title', 'timestamp', 'ends_at', 'version'}, or None"""
+        return schedule_snapshot.get('now_playing', _load_now_playing, data='now_playing')
+
+def _load_now_playing(conn):
+    row = conn.execute("SELECT file_path, title, timestamp, ends_at, version FROM now_playing WHERE id = 1").fetchone()
+    if row is None:
+        return None
+    return dict(zip(('file_path', 'title', 'timestamp', 'ends_at', 'version'), row))
+
+
+# 프로세스 전역 현재 재생 채널
+now_playing = NowPlayingChannel()
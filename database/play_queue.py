@@ -0,0 +1,119 @@
+# database/play_queue.py
+import logging
+import time as time_module
+
+from database.connection import get_connection, transaction
+from database.now_playing import now_playing
+from database.snapshot import schedule_snapshot
+from monitoring.metrics import fire_lag
+
+logger = logging.getLogger(__name__)
+
+# 대기열 우선순위 - 값이 클수록 먼저 재생, 같으면 예약 시각 순
+PRIORITY_SCHEDULED = 0
+PRIORITY_HIGH = 10
+
+_QUEUE_COLUMNS = ('id', 'file_path', 'title', 'priority', 'scheduled_at', 'duration_seconds', 'schedule_id')
+
+
+class PlayQueue:
+    """Persistent queue of videos waiting for the player.
+
+    Schedules that fire while another video is playing wait here instead
+    of replacing it. Entries are ordered by priority, then by scheduled
+    time; the ordering index makes each enqueue and each pop a single
+    B-tree operation, so a burst of fires costs O(log n) per entry. The
+    next entry starts once the current video's ends_at has passed, or as
+    soon as an entry that became due after a video of unknown length
+    started is waiting.
+    """
+
+    def enqueue(self, file_path, title, scheduled_at=None, priority=PRIORITY_SCHEDULED,
+                duration_seconds=None, schedule_id=None):
+        """Append a video to the queue (joins the caller's transaction if one is open)"""
+        scheduled_at = int(scheduled_at if scheduled_at is not None else time_module.time())
+        self.enqueue_many([(file_path, title, priority, scheduled_at, duration_seconds, schedule_id)])
+
+    def enqueue_many(self, entries):
+        """Append (file_path, title, priority, scheduled_at, duration_seconds, schedule_id) tuples in one statement"""
+        with transaction() as conn:
+            conn.executemany('''
+                INSERT INTO play_queue (file_path, title, priority, scheduled_at, duration_seconds, schedule_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', entries)
+
+    def advance(self, now=None, skip=False):
+        """Start the next queued video if nothing is playing (or skip is set).
+
+        Returns the epoch at which the current video ends and the queue
+        should be advanced again, or None if nothing is waiting.
+        """
+        now = time_module.time() if now is None else now
+        conn = get_connection()
+        if not skip:
+            # 쓰기 잠금 없이 먼저 확인 - 재생 중이거나 대기열이 비었으면 할 일 없음
+            ends_at = self._playing_until(conn, now)
+            if ends_at is not None:
+                return ends_at
+            if conn.execute("SELECT 1 FROM play_queue LIMIT 1").fetchone() is None:
+                return None
+        with transaction() as conn:
+            # 잠금을 잡은 뒤 다시 확인 (다른 프로세스가 먼저 넘겼을 수 있음)
+            ends_at = self._playing_until(conn, now)
+            if not skip and ends_at is not None:
+                return ends_at
+            row = conn.execute('''
+                SELECT id, file_path, title, scheduled_at, duration_seconds, schedule_id FROM play_queue
+                ORDER BY priority DESC, scheduled_at, id
+                LIMIT 1
+            ''').fetchone()
+            if row is None:
+                if skip:
+                    now_playing.clear()
+                return None
+            entry_id, file_path, title, scheduled_at, duration_seconds, schedule_id = row
+            conn.execute("DELETE FROM play_queue WHERE id = ?", (entry_id,))
+            logger.info("Playing video: %s", title, extra={'queue_id': entry_id})
+            ends_at = now_playing.publish(file_path, title, duration_seconds)['ends_at']
+        if schedule_id is not None:
+            fire_lag.observe(max(0.0, now - scheduled_at))
+        return ends_at
+
+    def items(self, limit=20):
+        """The next queued entries in play order, as dicts"""
+        def load(conn):
+            rows = conn.execute(f'''
+                SELECT {', '.join(_QUEUE_COLUMNS)} FROM play_queue
+                ORDER BY priority DESC, scheduled_at, id
+                LIMIT ?
+            ''', (limit,)).fetchall()
+            return [dict(zip(_QUEUE_COLUMNS, row)) for row in rows]
+        return schedule_snapshot.get(('play_queue', limit), load, data='play_queue')
+
+    def __len__(self):
+        return schedule_snapshot.get(
+            'play_queue_count', lambda conn: conn.execute("SELECT COUNT(*) FROM play_queue").fetchone()[0],
+            data='play_queue')
+
+    def clear(self):
+        with transaction() as conn:
+            conn.execute("DELETE FROM play_queue")
+
+    @staticmethod
+    def _playing_until(conn, now):
+        # 현재 비디오가 대기열을 막고 있으면 끝나는 시각, 아니면 None
+        row = conn.execute("SELECT ends_at, started_at, duration_seconds FROM now_playing WHERE id = 1").fetchone()
+        # ends_at이 없는 이전 버전 행은 끝난 것으로 간주
+        if row is None or row[0] is None or row[0] <= now:
+            return None
+        ends_at, started_at, duration_seconds = row
+        # 재생 시간을 모르면 시작한 뒤에 예약 시각이 된 항목이 기다리지 않고 이어받음
+        # (같은 순간에 예약된 항목만 DEFAULT_PLAY_SECONDS 뒤에 차례로 재생)
+        if duration_seconds is None and started_at is not None and conn.execute(
+                "SELECT 1 FROM play_queue WHERE scheduled_at > ? LIMIT 1", (started_at,)).fetchone():
+            return None
+        return ends_at
+
+
+# 프로세스 전역 재생 대기열
+play_queue = PlayQueue()
@@ -0,0 +1,258 @@
+# database/recurrence.py
+from bisect import bisect_left
+from datetime import datetime, date, timedelta
+from functools import lru_cache
+
+# 반복 규칙 문자열 형식 (schedules.recurrence 컬럼)
+#   daily                    매일 schedule_time
+#   weekdays:0,1,2,3,4       지정 요일 schedule_time (월=0 ... 일=6), "weekdays"만 쓰면 월~금
+#   date:2026-10-20          해당 날짜 schedule_time에 한 번
+#   every:15                 매일 schedule_time부터 자정 전까지 15분마다
+#   cron:*/5 9-17 * * 1-5    cron 5필드 (분 시 일 월 요일, 요일은 일=0), schedule_time 무시
+DEFAULT_RULE = 'daily'
+
+WEEKDAY_NAMES = ["월", "화", "수", "목", "금", "토", "일"]
+
+# cron 요일 검사 시 최대 탐색 기간 (윤년 2월 29일 같은 드문 조합까지 포함)
+CRON_SEARCH_DAYS = 366 * 8
+
+
+def _parse_time(schedule_time):
+    hour, minute = (int(part) for part in schedule_time.strip().split(':'))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"잘못된 시간입니다: {schedule_time}")
+    return hour, minute
+
+def _floor_minute(now):
+    # 현재 분도 아직 재생 가능한 회차로 취급 (10:30:20에 확인하면 10:30 회차가 대상)
+    return now.replace(second=0, microsecond=0)
+
+
+class DailyRule:
+    """Every day (or on selected weekdays) at a fixed HH:MM"""
+
+    def __init__(self, hour, minute, weekdays=range(7)):
+        self.hour = hour
+        self.minute = minute
+        self.weekdays = frozenset(weekdays)
+        if not self.weekdays:
+            raise ValueError("요일을 하나 이상 선택해주세요.")
+
+    def next_after(self, now):
+        start = _floor_minute(now)
+        for offset in range(8):
+            day = start.date() + timedelta(days=offset)
+            if day.weekday() not in self.weekdays:
+                continue
+            candidate = datetime.combine(day, datetime.min.time()).replace(hour=self.hour, minute=self.minute)
+            if candidate >= start:
+                return candidate
+        return None
+
+
+class DateRule:
+    """Once, on a specific date at HH:MM"""
+
+    def __init__(self, hour, minute, on_date):
+        self.at = datetime.combine(on_date, datetime.min.time()).replace(hour=hour, minute=minute)
+
+    def next_after(self, now):
+        return self.at if self.at >= _floor_minute(now) else None
+
+
+class IntervalRule:
+    """Every N minutes each day, starting at HH:MM and stopping at midnight"""
+
+    def __init__(self, hour, minute, every_minutes):
+        if every_minutes <= 0:
+            raise ValueError("반복 간격은 1분 이상이어야 합니다.")
+        self.start_minute = hour * 60 + minute
+        self.step = every_minutes
+
+    def next_after(self, now):
+        start = _floor_minute(now)
+        minute_of_day = start.hour * 60 + start.minute
+        if minute_of_day <= self.start_minute:
+            offset = self.start_minute
+        else:
+            steps = -(-(minute_of_day - self.start_minute) // self.step)
+            offset = self.start_minute + steps * self.step
+        if offset >= 24 * 60:
+            # 오늘 회차가 끝났으면 다음 날 시작 시각
+            return datetime.combine(start.date() + timedelta(days=1), datetime.min.time()) + timedelta(minutes=self.start_minute)
+        return datetime.combine(start.date(), datetime.min.time()) + timedelta(minutes=offset)
+
+
+class CronRule:
+    """Five-field cron expression (minute hour day-of-month month day-of-week)"""
+
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron 식은 5개 필드가 필요합니다: {expression}")
+        minutes, hours, days, months, weekdays = (
+            self._parse_field(part, low, high) for part, (low, high) in zip(parts, self.FIELDS)
+        )
+        self.minutes = sorted(minutes)
+        self.hours = sorted(hours)
+        self.days = days
+        self.months = months
+        # cron 요일 (일=0 또는 7) -> date.weekday() (월=0)
+        self.weekdays = {(value - 1) % 7 for value in weekdays}
+        # 일/요일이 모두 지정되면 둘 중 하나만 맞아도 실행 (표준 cron 동작)
+        self.any_day = parts[2] == '*'
+        self.any_weekday = parts[4] == '*'
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for item in field.split(','):
+            step = 1
+            if '/' in item:
+                item, step_text = item.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f"잘못된 cron 간격입니다: {field}")
+            if item == '*':
+                start, end = low, high
+            elif '-' in item:
+                start, end = (int(part) for part in item.split('-', 1))
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+            if not (low <= start <= end <= high):
+                raise ValueError(f"cron 값이 범위를 벗어났습니다: {field}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        day_ok = day.day in self.days
+        weekday_ok = day.weekday() in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, now):
+        start = _floor_minute(now)
+        day = start.date()
+        for _ in range(CRON_SEARCH_DAYS):
+            if self._day_matches(day):
+                first_hour = start.hour if day == start.date() else 0
+                for hour in self.hours[bisect_left(self.hours, first_hour):]:
+                    first_minute = start.minute if (day == start.date() and hour == start.hour) else 0
+                    index = bisect_left(self.minutes, first_minute)
+                    if index < len(self.minutes):
+                        return datetime.combine(day, datetime.min.time()).replace(hour=hour, minute=self.minutes[index])
+            day += timedelta(days=1)
+        return None
+
+
+@lru_cache(maxsize=4096)
+def compile_rule(recurrence, schedule_time):
+    """Parse a recurrence rule once into an object with next_after(datetime).
+
+    Raises ValueError for malformed rules or times.
+    """
+    recurrence = (recurrence or DEFAULT_RULE).strip()
+    kind, separator, argument = recurrence.partition(':')
+    kind = kind.strip().lower()
+    argument = argument.strip()
+    if kind == 'cron':
+        return CronRule(argument)
+    hour, minute = _parse_time(schedule_time)
+    if kind == 'daily':
+        return DailyRule(hour, minute)
+    if kind == 'weekdays':
+        weekdays = [int(day) for day in argument.split(',') if day.strip()] if separator else range(5)
+        if any(not 0 <= day <= 6 for day in weekdays):
+            raise ValueError(f"요일은 0(월)~6(일) 사이여야 합니다: {recurrence}")
+        return DailyRule(hour, minute, weekdays)
+    if kind == 'date':
+        return DateRule(hour, minute, date.fromisoformat(argument))
+    if kind == 'every':
+        return IntervalRule(hour, minute, int(argument))
+    raise ValueError(f"알 수 없는 반복 규칙입니다: {recurrence}")
+
+def validate_rule(recurrence, schedule_time):
+    """Raise ValueError if the rule cannot be compiled"""
+    compile_rule(recurrence, schedule_time)
+
+# 규칙과 시간을 정규화한 문자열 - 같으면 같은 순간에 재생됨 (중복 예약 판별용)
+def fire_key(recurrence, schedule_time):
+    """Canonical text of when a schedule fires, e.g. 'weekdays:0,4 09:00' or 'cron:0 9 * * 1'.
+
+    Equivalent spellings map to the same key: weekdays with all seven days
+    is daily, weekday lists are sorted, and cron ignores schedule_time.
+    Raises ValueError for malformed rules or times.
+    """
+    rule = compile_rule(recurrence, schedule_time)
+    recurrence = (recurrence or DEFAULT_RULE).strip()
+    kind, _, argument = recurrence.partition(':')
+    kind = kind.strip().lower()
+    if kind == 'cron':
+        return f"cron:{' '.join(argument.split())}"
+    if isinstance(rule, DailyRule):
+        at = f"{rule.hour:02d}:{rule.minute:02d}"
+        if len(rule.weekdays) == 7:
+            return f"daily {at}"
+        return f"weekdays:{','.join(str(day) for day in sorted(rule.weekdays))} {at}"
+    if isinstance(rule, DateRule):
+        return f"date:{rule.at:%Y-%m-%d %H:%M}"
+    return f"every:{rule.step} {rule.start_minute // 60:02d}:{rule.start_minute % 60:02d}"
+
+# 다음 재생 시각 계산
+def next_fire_time(schedule_time, now=None, recurrence=DEFAULT_RULE):
+    """Return the epoch (int) of the next occurrence at or after now, or None if there is none.
+
+    The current minute still counts as upcoming, so a schedule due at 10:30
+    evaluated at 10:30:20 is due now instead of on its next occurrence.
+    """
+    try:
+        rule = compile_rule(recurrence, schedule_time)
+    except (AttributeError, TypeError, ValueError):
+        return None
+    fire_at = rule.next_after(now or datetime.now())
+    return int(fire_at.timestamp()) if fire_at else None
+
+# 방금 재생한 회차 이후의 다음 재생 시각
+def following_fire_time(schedule_time, run_at, now, recurrence=DEFAULT_RULE):
+    """Return the first occurrence after the one at run_at, skipping any already in the past"""
+    after = max(datetime.fromtimestamp(now), datetime.fromtimestamp(run_at) + timedelta(minutes=1))
+    return next_fire_time(schedule_time, after, recurrence)
+
+def upcoming_occurrences(schedule_time, recurrence=DEFAULT_RULE, count=5, now=None):
+    """List the next few occurrences as datetimes (for previews in the UI)"""
+    try:
+        rule = compile_rule(recurrence, schedule_time)
+    except (AttributeError, TypeError, ValueError):
+        return []
+    occurrences = []
+    cursor = now or datetime.now()
+    while len(occurrences) < count:
+        fire_at = rule.next_after(cursor)
+        if fire_at is None:
+            break
+        occurrences.append(fire_at)
+        cursor = fire_at + timedelta(minutes=1)
+    return occurrences
+
+def describe_rule(recurrence, schedule_time):
+    """Short Korean description of a rule for the schedule list"""
+    recurrence = (recurrence or DEFAULT_RULE).strip()
+    kind, _, argument = recurrence.partition(':')
+    if kind == 'daily':
+        return f"매일 {schedule_time}"
+    if kind == 'weekdays':
+        days = [int(day) for day in argument.split(',') if day.strip()] if argument else range(5)
+        return f"{','.join(WEEKDAY_NAMES[day] for day in sorted(days))} {schedule_time}"
+    if kind == 'date':
+        return f"{argument} {schedule_time} (한 번)"
+    if kind == 'every':
+        return f"매일 {schedule_time}부터 {argument}분마다"
+    if kind == 'cron':
+        return f"cron: {argument}"
+    return recurrence
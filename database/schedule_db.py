@@ -1,281 +1,404 @@
 # databse/schedule_db.py
 import sqlite3
-import pandas as pd
-from datetime import datetime, time
+import logging
+from datetime import datetime
 import time as time_module
 import os
-import json
-import re
-import webbrowser
+from contextlib import contextmanager
+
+from database.connection import get_connection, transaction
+from database.migrations import migrate
+from database.models import schedule_factory
+from database.now_playing import now_playing
+from database.play_queue import PRIORITY_SCHEDULED, play_queue
+from database.snapshot import schedule_snapshot
+from database.videos import ensure_video, extract_youtube_id
+from database.wake_channel import wake
+from database.youtube_urls import is_youtube_url, embed_url as get_youtube_embed_url
+from database.recurrence import DEFAULT_RULE, describe_rule, fire_key, next_fire_time, following_fire_time
+from monitoring.metrics import fire_lag, metrics
+
+logger = logging.getLogger(__name__)
+
+# 지연 허용 시간 (초) - 예약 시각을 이 시간 이내로 놓친 스케줄은 늦게라도 재생하고,
+# 그보다 오래 지난 회차는 재생하지 않고 다음 회차로 넘긴다 (절전 모드 복귀 등)
+MISFIRE_GRACE_SECONDS = 300
+# 재생 기록(fire_log) 보존 기간 (초) - 지연 허용 시간보다 오래된 회차는 다시 재생될 수 없으므로
+# 중복 재생 방지에는 그 기간만 필요하고, 나머지는 진단용으로 며칠만 남긴다
+FIRE_LOG_RETENTION_SECONDS = 3 * 24 * 60 * 60
+
+# 스케줄러 지표 (사이드바 진단 패널과 Prometheus 텍스트 출력)
+_tick_seconds = metrics.histogram('scheduler_tick_seconds', "Wall time of one fire_due_schedules tick")
+_db_seconds = metrics.histogram('scheduler_db_seconds', "Time spent in the tick's write transaction")
+_scanned = metrics.counter('scheduler_scanned_total', "Due schedule rows read by ticks")
+_fired = metrics.counter('scheduler_fired_total', "Occurrences queued or played")
+_missed = metrics.counter('scheduler_missed_total', "Occurrences skipped because they were older than the grace window")
+_already_fired = metrics.counter('scheduler_already_fired_total', "Due occurrences that fire_log had already recorded")
+
+# 스케줄 변경 리스너 (스케줄러 엔진이 대기 중에 즉시 깨어나도록 알림, 다른 프로세스는 wake_channel로)
+_change_listeners = []
+
+def add_change_listener(callback):
+    """Register a callback invoked after any schedule is added, updated, toggled or deleted"""
+    if callback not in _change_listeners:
+        _change_listeners.append(callback)
+
+def remove_change_listener(callback):
+    """Unregister a callback added with add_change_listener"""
+    if callback in _change_listeners:
+        _change_listeners.remove(callback)
+
+def _notify_change():
+    if not _change_listeners:
+        # 이 프로세스에 엔진이 없으면 (데몬이나 다른 서버가 실행 중) 그 프로세스를 깨움
+        wake()
+        return
+    for callback in list(_change_listeners):
+        try:
+            callback()
+        except Exception:
+            logger.exception("Schedule change listener error")
 
 # 데이터베이스 초기화
 def init_db():
-    conn = sqlite3.connect('schedule.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS schedules (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            schedule_time TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            file_type TEXT NOT NULL,
-            title TEXT,
-            category TEXT DEFAULT 'Music',
-            is_active INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_played TEXT DEFAULT NULL
-        )
-    ''')
-    
-    # 기존 테이블에 last_played 컬럼 추가 (이미 있으면 무시)
-    try:
-        c.execute('ALTER TABLE schedules ADD COLUMN last_played TEXT DEFAULT NULL')
-        conn.commit()
-    except:
-        pass
-    
-    # 기존 테이블에 category 컬럼 추가 (이미 있으면 무시)
+    """Create or upgrade the schema by applying pending migrations"""
+    return migrate()
+
+# 같은 비디오를 같은 순간에 재생하는 활성 스케줄이 이미 있으면 (video_id, fire_key) 유일 인덱스 위반 → ValueError
+@contextmanager
+def _rejecting_duplicates(schedule_time, recurrence):
     try:
-        c.execute('ALTER TABLE schedules ADD COLUMN category TEXT DEFAULT "Music"')
-        conn.commit()
-    except:
-        pass
-    
-    conn.close()
+        yield
+    except sqlite3.IntegrityError as e:
+        if 'schedules.video_id' not in str(e):
+            raise
+        raise ValueError(f"같은 비디오가 이미 {describe_rule(recurrence, schedule_time)}에 예약되어 있습니다.") from None
 
 # 스케줄 추가
-def add_schedule(schedule_time, file_path, file_type, title, category="Music"):
-    conn = sqlite3.connect('schedule.db')
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO schedules (schedule_time, file_path, file_type, title, category)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (schedule_time, file_path, file_type, title, category))
-    conn.commit()
-    conn.close()
-
-# 스케줄 조회
+def add_schedule(schedule_time, file_path, file_type, title, category="Music", recurrence=DEFAULT_RULE, video_id=None):
+    # 반복 규칙은 저장 전에 한 번 검증 (잘못된 규칙은 ValueError)
+    key = fire_key(recurrence, schedule_time)
+    if file_type == 'youtube' and not video_id:
+        video_id = extract_youtube_id(file_path)
+    with _rejecting_duplicates(schedule_time, recurrence), transaction() as conn:
+        if video_id:
+            ensure_video(conn, video_id, title)
+        conn.execute('''
+            INSERT INTO schedules (schedule_time, file_path, file_type, title, category, recurrence, next_run_at, video_id,
+                                   fire_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (schedule_time, file_path, file_type, title, category, recurrence,
+              next_fire_time(schedule_time, recurrence=recurrence), video_id, key))
+    _notify_change()
+
+# 스케줄 여러 개 추가 (일괄 가져오기용 - 한 트랜잭션, executemany)
+def add_schedules(schedules):
+    """Insert many validated schedules in one transaction and return how many were added.
+
+    ``schedules`` holds (schedule_time, file_path, file_type, title, category,
+    recurrence, is_active, video_id) tuples; see database.bulk for validation.
+    Active rows that repeat a video already scheduled to fire at the same
+    moments (same fire_key) are skipped.
+    """
+    # 같은 (시간, 규칙)의 fire_key와 다음 재생 시각은 한 번만 계산
+    fire_times = {}
+    rows = []
+    for schedule_time, file_path, file_type, title, category, recurrence, is_active, video_id in schedules:
+        rule = (schedule_time, recurrence)
+        if rule not in fire_times:
+            fire_times[rule] = (fire_key(recurrence, schedule_time),
+                                next_fire_time(schedule_time, recurrence=recurrence))
+        key, next_run_at = fire_times[rule]
+        rows.append((schedule_time, file_path, file_type, title, category, recurrence, is_active,
+                     next_run_at if is_active else None, video_id, key))
+    if not rows:
+        return 0
+    with transaction() as conn:
+        conn.executemany("INSERT OR IGNORE INTO videos (video_id, title) VALUES (?, ?)",
+                         [(row[8], row[3]) for row in rows if row[8]])
+        # rowcount는 executemany 전체에서 실제로 추가된 행 수 (건너뛴 중복과 트리거 변경은 제외)
+        inserted = conn.executemany('''
+            INSERT INTO schedules (schedule_time, file_path, file_type, title, category, recurrence, is_active,
+                                   next_run_at, video_id, fire_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT DO NOTHING
+        ''', rows).rowcount
+    _notify_change()
+    return inserted
+
+# Schedule 레코드를 돌려주는 커서
+def _schedule_cursor(conn):
+    cursor = conn.cursor()
+    cursor.row_factory = schedule_factory
+    return cursor
+
+# 스케줄 조회 (videos 메타데이터를 한 번의 조인으로 함께 조회)
+def _load_schedules(conn):
+    return tuple(_schedule_cursor(conn).execute('''
+        SELECT s.*, v.channel, v.duration_seconds, v.view_count_text
+        FROM schedules s
+        LEFT JOIN videos v ON v.video_id = s.video_id
+        ORDER BY s.schedule_time, s.id
+    '''))
+
 def get_schedules():
-    conn = sqlite3.connect('schedule.db')
-    df = pd.read_sql_query("SELECT * FROM schedules ORDER BY schedule_time", conn)
-    conn.close()
-    return df
+    """All schedules as a tuple of Schedule records from the shared snapshot.
+
+    The tuple is shared with other callers until the database changes, so
+    treat it and its records as read-only.
+    """
+    return schedule_snapshot.get('schedules', _load_schedules)
+
+# 목록 필터 조건 (카테고리 / 활성 여부 / 파일 유형)
+def _schedule_filters(category=None, is_active=None, file_type=None):
+    clauses, params = [], []
+    if category:
+        clauses.append("s.category = ?")
+        params.append(category)
+    if is_active is not None:
+        clauses.append("s.is_active = ?")
+        params.append(1 if is_active else 0)
+    if file_type:
+        clauses.append("s.file_type = ?")
+        params.append(file_type)
+    return clauses, params
+
+# 스케줄 목록 페이지 조회 (keyset 페이지네이션)
+def list_schedules(after=None, limit=20, category=None, is_active=None, file_type=None):
+    """Return one page of Schedule records ordered by (schedule_time, id) and the cursor of the next page.
+
+    ``after`` is the (schedule_time, id) cursor returned for the previous
+    page, or None for the first page. The next cursor is None on the last page.
+    """
+    clauses, params = _schedule_filters(category, is_active, file_type)
+    if after is not None:
+        clauses.append("(s.schedule_time, s.id) > (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    
+    def load(conn):
+        # 다음 페이지 존재 여부를 알기 위해 한 행 더 조회
+        page = tuple(_schedule_cursor(conn).execute(f'''
+            SELECT s.*, v.channel, v.duration_seconds, v.view_count_text
+            FROM schedules s
+            LEFT JOIN videos v ON v.video_id = s.video_id
+            {where}
+            ORDER BY s.schedule_time, s.id
+            LIMIT ?
+        ''', params + [limit + 1]))
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = (page[-1].schedule_time, page[-1].id)
+        return page, next_cursor
+    
+    return schedule_snapshot.get(('list', tuple(params), where, limit), load)
+
+def count_schedules(category=None, is_active=None, file_type=None):
+    """Count schedules matching the same filters as list_schedules"""
+    clauses, params = _schedule_filters(category, is_active, file_type)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return schedule_snapshot.get(
+        ('count', tuple(params), where),
+        lambda conn: conn.execute(f"SELECT COUNT(*) FROM schedules s {where}", params).fetchone()[0],
+    )
+
+# 활성화된 스케줄의 (id, 다음 재생 시각) 조회 - 스케줄러 엔진용
+def get_pending_runs():
+    # 전체 행을 만들지 않고 idx_schedules_next_run 부분 인덱스만 읽음 (스냅샷 잠금도 잡지 않음)
+    return get_connection().execute('''
+        SELECT id, next_run_at FROM schedules
+        WHERE is_active = 1 AND next_run_at IS NOT NULL
+    ''').fetchall()
+
+# 단일 스케줄 조회
+def get_schedule(schedule_id):
+    """Return the Schedule record with this id, or None"""
+    return _schedule_cursor(get_connection()).execute("SELECT * FROM schedules WHERE id = ?", (schedule_id,)).fetchone()
 
 # 스케줄 삭제
 def delete_schedule(schedule_id):
-    conn = sqlite3.connect('schedule.db')
-    c = conn.cursor()
-    c.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,))
+    _notify_change()
 
 # 스케줄 수정
-def update_schedule(schedule_id, schedule_time, file_path, file_type, title, category="Music"):
-    conn = sqlite3.connect('schedule.db')
-    c = conn.cursor()
-    c.execute('''
-        UPDATE schedules 
-        SET schedule_time = ?, file_path = ?, file_type = ?, title = ?, category = ?
-        WHERE id = ?
-    ''', (schedule_time, file_path, file_type, title, category, schedule_id))
-    conn.commit()
-    conn.close()
+def update_schedule(schedule_id, schedule_time, file_path, file_type, title, category="Music", recurrence=None):
+    if recurrence is None:
+        # 반복 규칙을 지정하지 않으면 기존 규칙 유지
+        row = get_connection().execute("SELECT recurrence FROM schedules WHERE id = ?", (schedule_id,)).fetchone()
+        recurrence = row[0] if row else DEFAULT_RULE
+    key = fire_key(recurrence, schedule_time)
+    with _rejecting_duplicates(schedule_time, recurrence), transaction() as conn:
+        video_id = extract_youtube_id(file_path) if file_type == 'youtube' else None
+        if video_id:
+            ensure_video(conn, video_id, title)
+        conn.execute('''
+            UPDATE schedules 
+            SET schedule_time = ?, file_path = ?, file_type = ?, title = ?, category = ?, recurrence = ?, next_run_at = ?,
+                video_id = ?, fire_key = ?
+            WHERE id = ?
+        ''', (schedule_time, file_path, file_type, title, category, recurrence,
+              next_fire_time(schedule_time, recurrence=recurrence), video_id, key, schedule_id))
+    _notify_change()
 
 # 스케줄 활성화/비활성화
 def toggle_schedule(schedule_id, is_active):
-    conn = sqlite3.connect('schedule.db')
-    c = conn.cursor()
-    c.execute("UPDATE schedules SET is_active = ? WHERE id = ?", (is_active, schedule_id))
-    conn.commit()
-    conn.close()
-
-# YouTube URL 확인
-def is_youtube_url(url):
-    youtube_regex = (
-        r'(https?://)?(www\.)?'
-        r'(youtube|youtu|youtube-nocookie)\.(com|be)/'
-        r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})')
-    return re.match(youtube_regex, url) is not None
-
-# YouTube URL을 embed URL로 변환
-def get_youtube_embed_url(url):
-    """Convert YouTube URL to embed format for iframe display"""
-    # Extract video ID from various YouTube URL formats
-    patterns = [
-        r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([^&=%\?]{11})',
-        r'(?:https?://)?(?:www\.)?youtu\.be/([^&=%\?]{11})',
-        r'(?:https?://)?(?:www\.)?youtube\.com/embed/([^&=%\?]{11})',
-        r'(?:https?://)?(?:www\.)?youtube\.com/v/([^&=%\?]{11})'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            video_id = match.group(1)
-            return f'https://www.youtube.com/embed/{video_id}'
-    
-    # If no pattern matches, return original URL
-    return url
+    with transaction() as conn:
+        if is_active:
+            # 다시 활성화할 때는 비활성 기간에 지난 회차를 재생하지 않도록 지금부터 다시 계산
+            row = conn.execute("SELECT schedule_time, recurrence FROM schedules WHERE id = ?", (schedule_id,)).fetchone()
+            if row is None:
+                return
+            schedule_time, recurrence = row
+            # 같은 순간에 재생되는 활성 스케줄이 이미 있으면 ValueError
+            with _rejecting_duplicates(schedule_time, recurrence):
+                conn.execute("UPDATE schedules SET is_active = ?, next_run_at = ? WHERE id = ?",
+                             (is_active, next_fire_time(schedule_time, recurrence=recurrence), schedule_id))
+        else:
+            conn.execute("UPDATE schedules SET is_active = ? WHERE id = ?", (is_active, schedule_id))
+    _notify_change()
 
-# Current video management functions (Streamlit Cloud compatible)
-# Note: These functions now work with Streamlit session state passed from app.py
-# For backward compatibility, they also write to JSON file for local use
+# Current video management functions
+# 현재 재생 비디오는 now_playing 채널(SQLite 행) 하나로 모든 프로세스/세션에 전달한다.
+# (session_state 인자는 이전 호출과의 호환을 위해 남겨 둠)
 
 def set_current_video(file_path, title, session_state=None):
     """Set the current video to be played"""
-    video_data = {
-        'file_path': file_path,
-        'title': title,
-        'timestamp': datetime.now().isoformat()
-    }
-    
-    # Use session state if available (Streamlit Cloud)
-    if session_state is not None:
-        session_state['current_video'] = video_data
-    
-    # Also write to file for backward compatibility (local use)
-    try:
-        with open('current_video.json', 'w', encoding='utf-8') as f:
-            json.dump(video_data, f, ensure_ascii=False)
-    except:
-        pass  # Ignore file errors on Streamlit Cloud
+    now_playing.publish(file_path, title)
 
 def get_current_video(session_state=None):
     """Get the current video that should be playing"""
-    # Check session state first (Streamlit Cloud)
-    if session_state is not None and 'current_video' in session_state:
-        return session_state['current_video']
-    
-    # Fall back to file (local use)
-    try:
-        if os.path.exists('current_video.json'):
-            with open('current_video.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if data and isinstance(data, dict):
-                    return data
-    except Exception as e:
-        print(f"Error reading current video: {e}")
-    
-    return None
+    # 모든 프로세스/세션이 같은 채널 값을 봄 - DB가 바뀌었을 때만 다시 읽음
+    return now_playing.current()
 
 def clear_current_video(session_state=None):
     """Clear the current video"""
-    # Clear from session state (Streamlit Cloud)
-    if session_state is not None and 'current_video' in session_state:
-        del session_state['current_video']
+    now_playing.clear()
+
+# 플레이어에 넘길 URL (로컬 파일은 외부 프로그램으로 열기 때문에 None)
+def _player_url(file_path, file_type):
+    if file_type == 'youtube':
+        return get_youtube_embed_url(file_path)
+    if file_type == "html":
+        return f'file://{os.path.abspath(file_path)}'
+    return None
+
+# 스케줄 재생 처리 (check_schedule_once와 스케줄러 엔진에서 공통 사용)
+def play_schedule(file_path, file_type, title, session_state=None):
+    """Start playback of a single schedule entry"""
+    player_url = _player_url(file_path, file_type)
+    if player_url:
+        set_current_video(player_url, title, session_state)
+    elif file_type == 'local':
+        # For local files, still try to open (works only locally)
+        if os.path.exists(file_path):
+            if os.name == 'nt':
+                os.startfile(file_path)
+            else:
+                os.system(f'open "{file_path}"')
+
+# 예약 시각이 지난 스케줄 재생 및 다음 회차로 이동
+def fire_due_schedules(session_state=None, now=None, grace_seconds=None):
+    """Fire every active schedule whose next_run_at has passed and advance it to the next occurrence.
+
+    The whole tick runs in one write transaction, so a busy minute costs a
+    single commit. Each occurrence is claimed by inserting it into
+    fire_log, whose (schedule_id, occurrence) key makes firing exactly-once
+    even when a schedule is edited back onto an occurrence that already
+    fired, or when two schedulers share the database. Occurrences older
+    than the grace window are logged as missed and not played, and log
+    rows older than FIRE_LOG_RETENTION_SECONDS are pruned. Videos go
+    through the play queue in the same transaction, so schedules due at the
+    same time play one after another while a later schedule replaces a
+    video of unknown length. Local files are opened after the
+    commit. Returns a list of (schedule_id, next_run_at) for advanced rows.
+    """
+    started = time_module.perf_counter()
+    now = int(now if now is not None else time_module.time())
+    grace = MISFIRE_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    advanced, advance_rows, queue_entries, missed, local = [], [], [], [], []
     
-    # Also clear file (local use)
-    try:
-        if os.path.exists('current_video.json'):
-            os.remove('current_video.json')
-    except:
-        pass
+    with _db_seconds.time(), transaction() as conn:
+        due = _schedule_cursor(conn).execute('''
+            SELECT s.id, s.schedule_time, s.recurrence, s.file_path, s.file_type, s.title, s.next_run_at,
+                   v.duration_seconds
+            FROM schedules s
+            LEFT JOIN videos v ON v.video_id = s.video_id
+            WHERE s.is_active = 1 AND s.next_run_at <= ?
+            ORDER BY s.next_run_at, s.id
+        ''', (now,)).fetchall()
+        
+        for schedule in due:
+            run_at = schedule.next_run_at
+            # 규칙 평가는 재생된 행에 대해서만 (컴파일된 규칙은 캐시됨)
+            next_run_at = following_fire_time(schedule.schedule_time, run_at, now, schedule.recurrence)
+            player_url = _player_url(schedule.file_path, schedule.file_type)
+            if now - run_at > grace:
+                status = 'missed'
+            else:
+                status = 'queued' if player_url else 'played'
+            claimed = conn.execute('''
+                INSERT INTO fire_log (schedule_id, occurrence, fired_at, status) VALUES (?, ?, ?, ?)
+                ON CONFLICT (schedule_id, occurrence) DO NOTHING
+            ''', (schedule.id, run_at, now, status)).rowcount == 1
+            # 이미 기록된 회차도 다음 회차로는 넘김 (재생만 하지 않음)
+            played_at = datetime.fromtimestamp(run_at).strftime("%Y-%m-%d %H:%M") if claimed and status != 'missed' else None
+            advance_rows.append((next_run_at, played_at, schedule.id))
+            advanced.append((schedule.id, next_run_at))
+            if not claimed:
+                _already_fired.inc()
+                continue
+            if status == 'missed':
+                missed.append(schedule)
+            elif status == 'queued':
+                queue_entries.append((player_url, schedule.title, PRIORITY_SCHEDULED, run_at,
+                                      schedule.duration_seconds, schedule.id))
+            else:
+                local.append(schedule)
+        
+        conn.executemany(
+            "UPDATE schedules SET next_run_at = ?, last_played = COALESCE(?, last_played) WHERE id = ?",
+            advance_rows,
+        )
+        if queue_entries:
+            play_queue.enqueue_many(queue_entries)
+            play_queue.advance(now)
+        # 보존 기간이 지난 기록 정리 (fired_at 인덱스 범위 삭제 - 틱마다 몇 행 수준)
+        conn.execute("DELETE FROM fire_log WHERE fired_at < ?",
+                     (now - max(FIRE_LOG_RETENTION_SECONDS, grace),))
+    
+    fired_at = time_module.time()
+    _scanned.inc(len(due))
+    _missed.inc(len(missed))
+    _fired.inc(len(queue_entries) + len(local))
+    # 대기열에 넣은 비디오의 지연은 play_queue.advance가 실제로 재생할 때 기록
+    for schedule in local:
+        fire_lag.observe(max(0.0, fired_at - schedule.next_run_at))
+    
+    for schedule in missed:
+        logger.info("Missed schedule %s at %s (grace %ss), skipping", schedule.title,
+                    datetime.fromtimestamp(schedule.next_run_at), grace, extra={'schedule_id': schedule.id})
+    for schedule in local:
+        logger.info("Playing video: %s", schedule.title, extra={'schedule_id': schedule.id})
+        play_schedule(schedule.file_path, schedule.file_type, schedule.title, session_state)
+    _tick_seconds.observe(time_module.perf_counter() - started)
+    return advanced
 
 # Check schedule once (synchronous - called from main app)
 def check_schedule_once(session_state=None):
     """Check if any scheduled videos should play right now (non-blocking)"""
     try:
-        current_time = datetime.now().strftime("%H:%M")
-        conn = sqlite3.connect('schedule.db')
-        c = conn.cursor()
-        
-        # Debug logging
-        print(f"[DEBUG] Checking schedules at {current_time}")
-        
-        # Find active schedules matching current time
-        c.execute('''
-            SELECT * FROM schedules 
-            WHERE schedule_time = ? AND is_active = 1
-        ''', (current_time,))
-        
-        schedules = c.fetchall()
-        print(f"[DEBUG] Found {len(schedules)} matching schedules")
-        
-        for schedule in schedules:
-            schedule_id, _, file_path, file_type, title, category, _, _, last_played = schedule
-            print(f"[DEBUG] Processing schedule: {title} (category: {category}), last_played={last_played}")
-            
-            # Skip if last_played is 00:00
-            if last_played == "00:00":
-                print(f"[DEBUG] Skipping video {title} because last_played is 00:00")
-                continue
-            
-            # Check if not already played this minute
-            if last_played != current_time:
-                print(f"[DEBUG] Playing video: {title}")
-                # Play the video
-                if file_type == 'youtube':
-                    embed_url = get_youtube_embed_url(file_path)
-                    print(f"[DEBUG] Setting video in session_state: {embed_url}")
-                    set_current_video(embed_url, title, session_state)
-                elif file_type == 'local':
-                    # For local files, still try to open (works only locally)
-                    if os.path.exists(file_path):
-                        if os.name == 'nt':
-                            os.startfile(file_path)
-                        else:
-                            os.system(f'open "{file_path}"')
-                elif file_type == "html":
-                    set_current_video(f'file://{os.path.abspath(file_path)}', title, session_state)
-                
-                # Update database with play time
-                c.execute('UPDATE schedules SET last_played = ? WHERE id = ?', (current_time, schedule_id))
-                conn.commit()
-                print(f"[DEBUG] Updated last_played to {current_time}")
-            else:
-                print(f"[DEBUG] Already played at {last_played}, skipping")
-        
-        conn.close()
+        fire_due_schedules(session_state)
         return True
         
-    except Exception as e:
-        print(f"Schedule check error: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Schedule check error")
         return False
 
-# Background scheduler (legacy - kept for compatibility)
+# Background scheduler
 def check_schedule():
-    while True:
-        try:
-            current_time = datetime.now().strftime("%H:%M")
-            conn = sqlite3.connect('schedule.db')
-            c = conn.cursor()
-            
-            # 현재 시간과 일치하는 활성화된 스케줄 찾기
-            c.execute('''
-                SELECT * FROM schedules 
-                WHERE schedule_time = ? AND is_active = 1
-            ''', (current_time,))
-            
-            schedules = c.fetchall()
-            
-            for schedule in schedules:
-                schedule_id, _, file_path, file_type, title, category, _, _, last_played = schedule
-                
-                # Skip if last_played is 00:00
-                if last_played == "00:00":
-                    continue
-                
-                # 같은 시간대에 이미 재생되었는지 확인 (last_played와 current_time 비교)
-                if last_played != current_time:
-                    # 재생 처리
-                    if file_type == 'youtube':
-                        embed_url = get_youtube_embed_url(file_path)
-                        set_current_video(embed_url, title, session_state)
-                    elif file_type == 'local':
-                        if os.path.exists(file_path):
-                            os.startfile(file_path) if os.name == 'nt' else os.system(f'open "{file_path}"')
-                    elif file_type == "html":
-                        set_current_video(f'file://{os.path.abspath(file_path)}', title, session_state)
-                    
-                    # 데이터베이스에 재생 시간 업데이트
-                    c.execute('UPDATE schedules SET last_played = ? WHERE id = ?', (current_time, schedule_id))
-                    conn.commit()
-            
-            conn.close()
-            
-        except Exception as e:
-            print(f"스케줄 체크 오류: {e}")
-        
-        # 30초마다 체크
-        time_module.sleep(30)
\ No newline at end of file
+    """Run the schedule engine forever (blocking - start in a daemon thread)"""
+    # 30초 폴링 대신 다음 재생 시각까지 대기하는 우선순위 큐 기반 엔진 사용
+    from database.scheduler import ScheduleEngine
+    ScheduleEngine().run_forever()
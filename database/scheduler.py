@@ -0,0 +1,206 @@
+# database/scheduler.py
+import heapq
+import logging
+import os
+import threading
+import time as time_module
+from datetime import datetime
+
+from database import connection
+from database.play_queue import play_queue
+from database.process_lock import ProcessLock
+from database.schedule_db import (
+    add_change_listener,
+    remove_change_listener,
+    get_pending_runs,
+    fire_due_schedules,
+)
+from database.snapshot import schedule_snapshot
+from database.wake_channel import WakeListener
+from monitoring.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 서버 프로세스 간 스케줄러 중복 실행 방지용 잠금 파일 (데이터베이스 파일 경로 + 접미사)
+LOCK_SUFFIX = '.lock'
+
+# 시계 변경(서머타임, 수동 조정)에 대비해 최대 대기 시간을 제한
+MAX_SLEEP_SECONDS = 300
+# 다른 프로세스의 스케줄 변경 확인 주기 (PRAGMA data_version 한 번, 바뀌었을 때만 data_versions 조회)
+CHANGE_CHECK_SECONDS = 15
+
+_pending_runs = metrics.gauge('scheduler_pending_runs', "Active schedules waiting in the engine heap")
+
+
+class ScheduleEngine:
+    """Fire active schedules from a heap ordered by next fire time.
+
+    The engine sleeps until the earliest entry is due and is woken early by
+    schedule_db whenever a schedule is added, updated, toggled or deleted,
+    in this process or (through the wake channel) in another one.
+    It also wakes when the current video ends to start the next entry of
+    the play queue.
+    """
+
+    def __init__(self, session_state=None):
+        self.session_state = session_state
+        self._heap = []
+        # 힙은 엔진 스레드가 바꾸고 UI 스레드가 (scheduler_status로) 읽음
+        self._heap_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._dirty = True
+        self._stopped = False
+        self._version = None
+        self._queue_at = None
+
+    def notify(self):
+        """Mark the schedule set as changed and wake the engine"""
+        self._dirty = True
+        self._wakeup.set()
+
+    def stop(self):
+        self._stopped = True
+        self._wakeup.set()
+
+    def next_fire_at(self):
+        """Epoch of the earliest pending fire, or None if nothing is scheduled"""
+        with self._heap_lock:
+            return self._heap[0][0] if self._heap else None
+
+    def _next_wakeup(self):
+        candidates = [at for at in (self.next_fire_at(), self._queue_at) if at is not None]
+        return min(candidates) if candidates else None
+
+    def _reload(self):
+        self._version = schedule_snapshot.version()
+        heap = [(run_at, schedule_id) for schedule_id, run_at in get_pending_runs()]
+        heapq.heapify(heap)
+        with self._heap_lock:
+            self._heap = heap
+        _pending_runs.set(len(heap))
+        # 다른 프로세스가 대기열에 추가했거나 재생을 중지했을 수 있음
+        self._queue_at = play_queue.advance()
+
+    def _fire_due(self):
+        now = time_module.time()
+        with self._heap_lock:
+            while self._heap and self._heap[0][0] <= now:
+                heapq.heappop(self._heap)
+        # 실제 재생 대상은 DB의 범위 조회(next_run_at <= now)로 결정하고, 힙은 대기 시간 계산에만 사용
+        fired = fire_due_schedules(self.session_state, now)
+        with self._heap_lock:
+            for schedule_id, next_run_at in fired:
+                if next_run_at is not None:
+                    heapq.heappush(self._heap, (next_run_at, schedule_id))
+            _pending_runs.set(len(self._heap))
+        self._queue_at = play_queue.advance(now)
+
+    def run_forever(self):
+        add_change_listener(self.notify)
+        try:
+            while not self._stopped:
+                try:
+                    if self._dirty:
+                        self._dirty = False
+                        self._reload()
+                    next_at = self._next_wakeup()
+                    timeout = min(MAX_SLEEP_SECONDS, CHANGE_CHECK_SECONDS)
+                    if next_at is not None:
+                        timeout = min(timeout, max(0.0, next_at - time_module.time()))
+                    if self._wakeup.wait(timeout):
+                        self._wakeup.clear()
+                        continue
+                    if next_at is None or next_at > time_module.time():
+                        # 아직 재생 시각 전 - 다른 프로세스가 스케줄을 바꿨을 때만 다시 읽음
+                        if schedule_snapshot.changed_since(self._version):
+                            self._dirty = True
+                        continue
+                    self._fire_due()
+                except Exception:
+                    logger.exception("스케줄 체크 오류")
+                    time_module.sleep(1)
+        finally:
+            remove_change_listener(self.notify)
+
+
+# 프로세스 전역 스케줄러 런타임 (브라우저 세션 수와 무관하게 하나만 실행)
+_runtime_lock = threading.Lock()
+_engine = None
+_thread = None
+_process_lock = None
+_wake_listener = None
+_started_at = None
+_standby = False
+
+def _database_lock():
+    # 같은 데이터베이스를 쓰는 프로세스끼리만 잠금을 공유 (--db나 set_db_path로 바꾼 경로 기준)
+    global _process_lock
+    path = connection.sidecar_path(LOCK_SUFFIX)
+    if _process_lock is None or (not _process_lock.held and _process_lock.path != path):
+        _process_lock = ProcessLock(path)
+    return _process_lock
+
+def start_scheduler():
+    """Start the shared scheduler for this server process if no process already runs one.
+
+    Safe to call on every Streamlit rerun: it returns immediately when the
+    scheduler is running here, and retries the cross-process lock when
+    another process owns it (taking over if that process has exited).
+    """
+    global _engine, _thread, _wake_listener, _started_at, _standby
+    with _runtime_lock:
+        if _thread is not None and _thread.is_alive():
+            return scheduler_status()
+        _standby = not _database_lock().acquire()
+        if _standby:
+            return scheduler_status()
+        _engine = ScheduleEngine()
+        _thread = threading.Thread(target=_engine.run_forever, name='schedule-engine', daemon=True)
+        _thread.start()
+        try:
+            _wake_listener = WakeListener(_engine.notify).start()
+        except OSError as e:
+            # 깨우기 채널 없이도 data_version 확인 주기로 변경을 반영
+            logger.warning("Wake channel unavailable: %s", e)
+        _started_at = datetime.now()
+        return scheduler_status()
+
+def stop_scheduler(timeout=5):
+    """Stop the scheduler running in this process and release the cross-process lock"""
+    global _engine, _thread, _wake_listener, _started_at, _standby
+    with _runtime_lock:
+        if _wake_listener is not None:
+            _wake_listener.stop()
+            _wake_listener = None
+        if _engine is not None:
+            _engine.stop()
+        if _thread is not None:
+            _thread.join(timeout)
+        _engine = None
+        _thread = None
+        _started_at = None
+        _standby = False
+        if _process_lock is not None:
+            _process_lock.release()
+        return scheduler_status()
+
+def scheduler_status():
+    """Describe the scheduler runtime of this process.
+
+    ``state`` is ``running`` when this process fires schedules, ``standby``
+    when another process holds the lock, and ``stopped`` otherwise.
+    """
+    running = _thread is not None and _thread.is_alive()
+    if running:
+        state = 'running'
+    elif _standby:
+        state = 'standby'
+    else:
+        state = 'stopped'
+    next_at = _engine.next_fire_at() if running else None
+    return {
+        'state': state,
+        'pid': os.getpid(),
+        'started_at': _started_at.isoformat() if _started_at else None,
+        'next_fire_at': datetime.fromtimestamp(next_at).isoformat() if next_at else None,
+    }
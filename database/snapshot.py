@@ -0,0 +1,92 @@
+# database/snapshot.py
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from database import connection
+
+# 같은 데이터 버전에서 기억해 둘 목록/개수 조회 결과 수 (데이터별)
+SNAPSHOT_QUERY_ENTRIES = 64
+
+
+class SnapshotCache:
+    """Read-through cache of schedule reads, invalidated only when their data changes.
+
+    Each entry belongs to one kind of data ('schedules', 'now_playing' or
+    'play_queue'), whose version is bumped by triggers in data_versions on
+    every write to that table. The cache reads through its own dedicated
+    connection, which never writes, so PRAGMA data_version on it changes
+    after any commit made elsewhere. Only then is data_versions read, and
+    only the kinds whose version moved are dropped: writes to the search
+    cache, the video metadata or the fire log leave cached schedules alone.
+    """
+
+    def __init__(self, max_queries=SNAPSHOT_QUERY_ENTRIES):
+        self.max_queries = max_queries
+        self._lock = threading.RLock()
+        self._conn = None
+        self._path = None
+        self._data_version = None
+        self._versions = {}
+        self._entries = {}
+
+    def _connection(self):
+        if self._conn is None or self._path != connection.DB_PATH:
+            if self._conn is not None:
+                self._conn.close()
+            self._path = connection.DB_PATH
+            self._conn = connection.open_connection(self._path, check_same_thread=False)
+            self._data_version = None
+            self._versions = {}
+            self._entries.clear()
+        return self._conn
+
+    def _refresh(self):
+        # 다른 연결이 커밋했을 때만 데이터별 버전을 읽고, 바뀐 데이터의 항목만 버림
+        conn = self._connection()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return conn
+        self._data_version = data_version
+        try:
+            versions = dict(conn.execute("SELECT name, version FROM data_versions"))
+        except sqlite3.OperationalError:
+            # 마이그레이션 전 - 모든 데이터가 바뀐 것으로 간주
+            versions = {name: ('data_version', data_version) for name in self._entries}
+        for name in list(self._entries):
+            if versions.get(name) != self._versions.get(name):
+                del self._entries[name]
+        self._versions = versions
+        return conn
+
+    def version(self, data='schedules'):
+        """Current version of one kind of data; changes whenever it is written"""
+        with self._lock:
+            self._refresh()
+            return self._versions.get(data)
+
+    def changed_since(self, version, data='schedules'):
+        return self.version(data) != version
+
+    def get(self, key, loader, data='schedules'):
+        """Return loader(conn) for key, reusing the previous result while data is unchanged"""
+        with self._lock:
+            conn = self._refresh()
+            entries = self._entries.get(data)
+            if entries is None:
+                entries = self._entries[data] = OrderedDict()
+            if key in entries:
+                entries.move_to_end(key)
+                return entries[key]
+            value = entries[key] = loader(conn)
+            while len(entries) > self.max_queries:
+                entries.popitem(last=False)
+            return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 프로세스 전역 스냅샷 (UI와 스케줄러가 공유)
+schedule_snapshot = SnapshotCache()
@@ -0,0 +1,69 @@
+# database/state_store.py
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class JsonStateStore:
+    """A small JSON value kept in one file, written atomically and read from cache.
+
+    Writes go to a temporary file that is renamed over the target, so a
+    concurrent reader sees either the old or the new value, never a
+    partial file. Reads stat the file and only re-parse it when its
+    (mtime, inode, size) changed since the last read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stat_key = None
+        self._value = None
+
+    def read(self):
+        """Return the stored value, or None if the file is missing or invalid"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            with self._lock:
+                self._stat_key, self._value = None, None
+            return None
+        stat_key = (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+        with self._lock:
+            if stat_key == self._stat_key:
+                return self._value
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    value = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("State file read error (%s): %s", self.path, e)
+                value = None
+            self._stat_key, self._value = stat_key, value
+            return value
+
+    def modified_at(self):
+        """Epoch of the last write, or None if the file does not exist"""
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def write(self, value):
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        try:
+            os.replace(temp_path, self.path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._stat_key, self._value = None, None
@@ -0,0 +1,74 @@
+# database/videos.py
+import re
+import time as time_module
+
+from database.connection import get_connection, transaction
+# YouTube URL에서 video ID 추출 (공용 파서, 입력별 메모이즈)
+from database.youtube_urls import video_id as extract_youtube_id
+
+# "1:02:03" / "3:21" 형식의 재생 시간을 초 단위로 변환
+def parse_duration(text):
+    """Convert a YouTube lengthText such as '1:02:03' to seconds, or None if unparseable"""
+    if not text or not isinstance(text, str):
+        return None
+    parts = text.strip().split(':')
+    if not all(part.isdigit() for part in parts) or len(parts) > 3:
+        return None
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+# "1,234,567 views" 형식의 조회수를 정수로 변환
+def parse_view_count(text):
+    if not text or not isinstance(text, str):
+        return None
+    digits = re.sub(r'[^0-9]', '', text)
+    return int(digits) if digits else None
+
+def format_duration(seconds):
+    """Format seconds as H:MM:SS or M:SS for display"""
+    if seconds is None:
+        return "N/A"
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+# 검색 결과(video_data)를 videos 테이블 행으로 변환
+def _video_row(video, updated_at):
+    return (
+        video['videoId'],
+        video.get('title'),
+        video.get('channel', {}).get('name'),
+        parse_duration(video.get('duration')),
+        video.get('viewCount', {}).get('short'),
+        video.get('viewCount', {}).get('value'),
+        updated_at,
+    )
+
+def upsert_videos(videos):
+    """Insert or refresh metadata for a batch of search results in one transaction"""
+    updated_at = int(time_module.time())
+    rows = [_video_row(video, updated_at) for video in videos if video.get('videoId')]
+    if not rows:
+        return 0
+    with transaction() as conn:
+        conn.executemany('''
+            INSERT INTO videos (video_id, title, channel, duration_seconds, view_count_text, view_count, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (video_id) DO UPDATE SET
+                title = excluded.title,
+                channel = excluded.channel,
+                duration_seconds = COALESCE(excluded.duration_seconds, videos.duration_seconds),
+                view_count_text = excluded.view_count_text,
+                view_count = COALESCE(excluded.view_count, videos.view_count),
+                updated_at = excluded.updated_at
+        ''', rows)
+    return len(rows)
+
+def ensure_video(conn, video_id, title=None):
+    """Make sure a videos row exists for video_id (used before referencing it from schedules)"""
+    conn.execute("INSERT OR IGNORE INTO videos (video_id, title) VALUES (?, ?)", (video_id, title))
+
+def get_video(video_id):
+    return get_connection().execute("SELECT * FROM videos WHERE video_id = ?", (video_id,)).fetchone()
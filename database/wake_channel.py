@@ -0,0 +1,102 @@
+# database/wake_channel.py
+"""Cross-process wake-up for the schedule engine.
+
+The process running the engine listens on a UDP socket bound to
+127.0.0.1 and records its port in a file next to the database. Other
+processes (the Streamlit UI while the daemon holds the scheduler lock)
+send one datagram there after editing schedules, so the engine reloads
+at once instead of on its next data_version poll. The datagram carries
+no data: a stray or forged ping only costs one reload.
+"""
+import logging
+import os
+import socket
+import threading
+
+from database import connection
+from database.state_store import JsonStateStore
+
+logger = logging.getLogger(__name__)
+
+# 엔진이 받는 포트를 기록하는 파일 - 데이터베이스 파일 경로 + 접미사
+WAKE_SUFFIX = '.wake.json'
+# 수신 스레드가 종료 요청을 확인하는 주기 (초)
+POLL_SECONDS = 1.0
+
+_stores = {}
+_sender = None
+_sender_lock = threading.Lock()
+
+def _store(path=None):
+    path = path or connection.sidecar_path(WAKE_SUFFIX)
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = JsonStateStore(path)
+    return store
+
+
+class WakeListener:
+    """Call ``callback`` whenever another process pings this database's wake channel"""
+
+    def __init__(self, callback, path=None):
+        self.callback = callback
+        self.path = path or connection.sidecar_path(WAKE_SUFFIX)
+        self._sock = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', 0))
+        sock.settimeout(POLL_SECONDS)
+        self._sock = sock
+        self._thread = threading.Thread(target=self._receive, name='schedule-wake', daemon=True)
+        self._thread.start()
+        _store(self.path).write({'port': sock.getsockname()[1], 'pid': os.getpid()})
+        return self
+
+    def _receive(self):
+        while not self._stopped.is_set():
+            try:
+                self._sock.recv(16)
+            except socket.timeout:
+                continue
+            except OSError:
+                # Windows는 이전 송신 대상이 닫혀 있으면 recv에서 ECONNRESET을 돌려줌
+                continue
+            try:
+                self.callback()
+            except Exception:
+                logger.exception("Wake callback error")
+
+    def stop(self, timeout=5):
+        if self._sock is None:
+            return
+        self._stopped.set()
+        self._thread.join(timeout)
+        self._sock.close()
+        self._sock = None
+        # 다른 프로세스가 이미 새 리스너를 등록했으면 그 파일은 남겨 둠
+        store = _store(self.path)
+        value = store.read()
+        if value and value.get('pid') == os.getpid():
+            try:
+                store.clear()
+            except OSError:
+                pass
+
+def wake(path=None):
+    """Ping the engine listening for this database, if any; never raises"""
+    global _sender
+    value = _store(path).read()
+    if not value or not value.get('port'):
+        return False
+    try:
+        with _sender_lock:
+            if _sender is None:
+                _sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            _sender.sendto(b'1', ('127.0.0.1', value['port']))
+    except OSError as e:
+        logger.debug("Wake ping failed: %s", e)
+        return False
+    return True
@@ -0,0 +1,65 @@
+# database/youtube_urls.py
+"""The one place YouTube URLs are parsed.
+
+Every supported form maps to the same canonical 11-character video ID:
+
+    https://www.youtube.com/watch?v=ID      (also m. / music. and extra query parameters)
+    https://youtu.be/ID
+    https://www.youtube.com/embed/ID        (also youtube-nocookie.com)
+    https://www.youtube.com/v/ID
+    https://www.youtube.com/shorts/ID
+    https://www.youtube.com/live/ID
+
+Parsing uses one precompiled pattern and is memoized on the input string,
+so re-rendering the same rows costs a dictionary lookup.
+"""
+import re
+from functools import lru_cache
+
+# 메모이즈할 URL 수
+URL_CACHE_SIZE = 4096
+
+_YOUTUBE_URL = re.compile(r'''
+    ^(?:https?://)?
+    (?:(?:www|m|music)\.)?
+    (?:
+        youtu\.be/(?P<short>[A-Za-z0-9_-]{11})
+      | (?:youtube\.com|youtube-nocookie\.com)/
+        (?:
+            (?:embed|v|e|shorts|live)/(?P<path>[A-Za-z0-9_-]{11})
+          | (?:watch)?/?\?(?:[^#]*?&)?v=(?P<query>[A-Za-z0-9_-]{11})
+        )
+    )
+    (?=[?&#/]|$)
+''', re.VERBOSE | re.IGNORECASE)
+
+_VIDEO_ID = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def video_id(url):
+    """Canonical video ID of a YouTube URL, or None if url is not one"""
+    if not url or not isinstance(url, str):
+        return None
+    match = _YOUTUBE_URL.match(url.strip())
+    if match is None:
+        return None
+    return match.group('short') or match.group('path') or match.group('query')
+
+def video_ids(urls):
+    """Batch form of video_id: a list of IDs (or None) in the same order as urls"""
+    return [video_id(url) for url in urls]
+
+def is_youtube_url(url):
+    return video_id(url) is not None
+
+def is_video_id(value):
+    return bool(value) and _VIDEO_ID.match(value) is not None
+
+def watch_url(youtube_id):
+    return f'https://www.youtube.com/watch?v={youtube_id}'
+
+def embed_url(url):
+    """Embed URL for iframe playback, or url itself if it is not a YouTube URL"""
+    found = video_id(url)
+    return f'https://www.youtube.com/embed/{found}' if found else url
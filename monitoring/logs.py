@@ -0,0 +1,204 @@
+# monitoring/logs.py
+"""Non-blocking structured logging for the scheduler.
+
+Module loggers under database/, youtube/ and monitoring/ hand records to
+an in-memory queue; a single listener thread formats them and does the
+file and console I/O. Logging from the scheduler tick is therefore a
+filter check and a queue put, never a disk write. The queue is bounded:
+when it is full the record is dropped and counted instead of blocking.
+
+Repeated identical messages (same logger, level and formatted message)
+are rate-limited, and the next one let through carries the number that
+were suppressed. The file is JSON Lines, rotated by size.
+
+    from monitoring.logs import configure_logging
+    configure_logging('daemon')
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+from monitoring.metrics import metrics
+
+LOG_DIR = 'logs'
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+# 같은 메시지를 다시 내보내기까지의 최소 간격 (초)
+RATE_LIMIT_SECONDS = 60
+# 간격 안에서 그대로 내보낼 같은 메시지 수
+RATE_LIMIT_BURST = 5
+# 처리 대기 중인 레코드 상한 - 넘치면 버림
+QUEUE_SIZE = 10000
+
+# 로깅을 설정할 최상위 패키지
+APP_LOGGERS = ('database', 'youtube', 'monitoring')
+
+# LogRecord 기본 속성 - 나머지는 extra로 넘어온 필드
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'suppressed'}
+
+_exception_formatter = logging.Formatter()
+
+_dropped = metrics.counter('log_records_dropped_total', "Log records dropped because the log queue was full")
+_suppressed = metrics.counter('log_records_suppressed_total', "Repeated log records suppressed by rate limiting")
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through RATE_LIMIT_BURST copies of a formatted message per window, then suppress until it ends"""
+
+    def __init__(self, interval=RATE_LIMIT_SECONDS, burst=RATE_LIMIT_BURST):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._seen = {}  # key -> [window_start, count, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        # 서식을 채운 메시지 기준 - 템플릿이 같아도 다른 스케줄/비디오 기록은 따로 셈
+        try:
+            message = record.getMessage()
+        except Exception:
+            message = record.msg
+        key = (record.name, record.levelno, message)
+        now = record.created
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None or now - entry[0] >= self.interval:
+                suppressed = entry[2] if entry is not None else 0
+                self._seen[key] = [now, 1, 0]
+                if len(self._seen) > QUEUE_SIZE:
+                    self._forget_expired(now)
+            elif entry[1] < self.burst:
+                entry[1] += 1
+                suppressed = 0
+            else:
+                entry[2] += 1
+                _suppressed.inc()
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+    def _forget_expired(self, now):
+        for key in [key for key, entry in self._seen.items() if now - entry[0] >= self.interval]:
+            del self._seen[key]
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking on a full queue"""
+
+    def prepare(self, record):
+        # 인자와 예외를 호출 스레드에서 문자열로 만들어 둠 - 리스너가 받을 때는 객체가 바뀌었을 수 있음
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped.inc()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, any extra fields, and exc if present"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value
+        if getattr(record, 'suppressed', None):
+            entry['suppressed'] = record.suppressed
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s', '%Y-%m-%d %H:%M:%S')
+
+    def format(self, record):
+        text = super().format(record)
+        if getattr(record, 'suppressed', None):
+            text += f" (+{record.suppressed} similar suppressed)"
+        return text
+
+
+_listener = None
+_lock = threading.Lock()
+
+
+def configure_logging(name='app', level=logging.INFO, log_dir=LOG_DIR, console=True):
+    """Route the app loggers through a background queue to logs/<name>.log (and stderr).
+
+    Safe to call more than once; only the first call in a process takes
+    effect until shutdown_logging(). Each process should use its own name, since a rotating file
+    cannot be shared between processes.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+        handlers = []
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                os.path.join(log_dir, f"{name}.log"), maxBytes=LOG_MAX_BYTES,
+                backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True)
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+        except OSError:
+            # 읽기 전용 환경 (Streamlit Cloud) - 콘솔만 사용
+            console = True
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(ConsoleFormatter())
+            handlers.append(console_handler)
+
+        log_queue = queue.Queue(QUEUE_SIZE)
+        queue_handler = DroppingQueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter())
+        for logger_name in APP_LOGGERS:
+            logger = logging.getLogger(logger_name)
+            logger.setLevel(level)
+            logger.addHandler(queue_handler)
+            logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Write out queued records, stop the listener thread and detach the queue handler"""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        for logger_name in APP_LOGGERS:
+            logger = logging.getLogger(logger_name)
+            for handler in list(logger.handlers):
+                if isinstance(handler, DroppingQueueHandler):
+                    logger.removeHandler(handler)
+            logger.propagate = True
+        _listener = None
+
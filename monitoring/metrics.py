@@ -0,0 +1,203 @@
+# monitoring/metrics.py
+"""In-process metrics with Prometheus text exposition.
+
+Counters, gauges and fixed-bucket histograms are registered by name in a
+process-wide registry. Recording is a lock and an add, cheap enough for
+the scheduler tick. The registry renders the Prometheus text format for
+a textfile collector or the optional HTTP endpoint, and a plain dict
+snapshot for the sidebar diagnostics panel.
+"""
+import os
+import threading
+import time as time_module
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 처리 시간용 기본 구간 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 예약 시각 대비 실제 재생 지연용 구간 (초)
+LAG_BUCKETS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def samples(self):
+        return [(self.name, '', self._value)]
+
+    def snapshot(self):
+        return self._value
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+
+class Histogram:
+    """Fixed-bucket histogram; quantiles are estimated as the upper bound of their bucket"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+            if value > self._max:
+                self._max = value
+
+    @contextmanager
+    def time(self):
+        """Observe the wall time spent in the with block"""
+        started = time_module.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time_module.perf_counter() - started)
+
+    def quantile(self, q):
+        with self._lock:
+            if not self._count:
+                return None
+            rank = q * self._count
+            cumulative = 0
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                if cumulative >= rank:
+                    return min(bound, self._max)
+            return self._max
+
+    def samples(self):
+        with self._lock:
+            counts, total, count = list(self._counts), self._sum, self._count
+        samples = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            samples.append((f"{self.name}_bucket", f'le="{_format_value(bound)}"', cumulative))
+        samples.append((f"{self.name}_sum", '', total))
+        samples.append((f"{self.name}_count", '', count))
+        return samples
+
+    def snapshot(self):
+        count = self._count
+        return {
+            'count': count,
+            'mean': self._sum / count if count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': self._max if count else None,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text):
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name, help_text):
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, buckets)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in sorted(self._metrics.values(), key=lambda metric: metric.name):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{{{labels}}} {_format_value(value)}" if labels else f"{name} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """{name: value} for counters and gauges, {name: {count, mean, p50, p95, max}} for histograms"""
+        return {name: metric.snapshot() for name, metric in list(self._metrics.items())}
+
+    def write_textfile(self, path):
+        """Atomically write render() to path (for a node_exporter textfile collector)"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+
+# 프로세스 전역 레지스트리
+metrics = MetricsRegistry()
+
+# 예약 시각과 실제 재생 사이의 지연 - 바로 재생(schedule_db)과 대기열 재생(play_queue)이 함께 기록
+fire_lag = metrics.histogram('scheduler_fire_lag_seconds', "Delay between an occurrence and its fire", LAG_BUCKETS)
+
+
+def serve(port, host='127.0.0.1', registry=metrics):
+    """Serve registry.render() at http://host:port/metrics from a daemon thread; returns the server"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
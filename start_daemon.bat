@@ -0,0 +1,4 @@
+@echo off
+cd /d "C:\Users\SCLuser\Desktop\youtube_scheduler"
+call venv\Scripts\activate
+python -m database.daemon
\ No newline at end of file
@@ -0,0 +1,15 @@
+# tests/conftest.py
+import pytest
+
+from database import connection
+from database.schedule_db import init_db
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A freshly migrated schedule database in a temporary directory"""
+    path = str(tmp_path / 'schedule.db')
+    monkeypatch.setattr(connection, 'DB_PATH', path)
+    init_db()
+    yield path
+    connection.close_connection()
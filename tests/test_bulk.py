@@ -0,0 +1,87 @@
+# tests/test_bulk.py
+import io
+import json
+
+import pytest
+
+from database import bulk
+from database.bulk import export_schedules, import_schedules
+from database.connection import get_connection
+
+
+def video_url(number):
+    return f'https://youtu.be/video{number:06d}'
+
+def schedule_rows(count):
+    return [{'schedule_time': f'{9 + number % 10:02d}:{number % 60:02d}', 'file_path': video_url(number),
+             'title': f'video {number}'} for number in range(count)]
+
+def as_csv(rows):
+    lines = ['schedule_time,file_path,title,recurrence']
+    lines += [f"{row['schedule_time']},{row['file_path']},{row['title']},{row.get('recurrence', '')}" for row in rows]
+    return io.StringIO('\n'.join(lines) + '\n')
+
+def stored_titles():
+    return [row[0] for row in get_connection().execute("SELECT title FROM schedules ORDER BY id")]
+
+
+def test_rows_are_imported_across_chunk_boundaries(db):
+    rows = schedule_rows(10)
+
+    report = import_schedules(as_csv(rows), 'csv', chunk_size=3)
+
+    assert (report.imported, report.duplicates, report.failed) == (10, 0, 0)
+    assert stored_titles() == [row['title'] for row in rows]
+
+def test_invalid_rows_are_reported_with_their_line_and_skipped(db):
+    rows = schedule_rows(7)
+    rows[4]['schedule_time'] = '25:00'
+    rows[5]['recurrence'] = 'every:0'
+
+    report = import_schedules(as_csv(rows), 'csv', chunk_size=3)
+
+    assert (report.imported, report.failed) == (5, 2)
+    # 헤더가 1번째 줄
+    assert [row_number for row_number, _ in report.errors] == [6, 7]
+    assert stored_titles() == [row['title'] for number, row in enumerate(rows) if number not in (4, 5)]
+
+def test_duplicates_in_different_chunks_are_skipped(db):
+    rows = schedule_rows(5)
+    # 첫 번째 청크 (0-2)와 두 번째 청크 (3-4)에 같은 비디오, 같은 규칙
+    rows.append(dict(rows[1], title='again'))
+    # 같은 시각이라도 규칙이 다르면 중복이 아님
+    rows.append(dict(rows[2], title='weekly', recurrence='weekdays:0'))
+
+    report = import_schedules(as_csv(rows), 'csv', chunk_size=3)
+
+    assert (report.imported, report.duplicates, report.failed) == (6, 1, 0)
+    assert 'again' not in stored_titles()
+
+@pytest.mark.parametrize('lines', [False, True])
+def test_json_is_streamed_in_small_pieces(db, monkeypatch, lines):
+    # 값이 읽기 조각 경계에서 잘리는 경우까지 확인
+    monkeypatch.setattr(bulk, 'READ_CHUNK_SIZE', 7)
+    rows = schedule_rows(8)
+    rows[3]['is_active'] = 0
+    text = '\n'.join(json.dumps(row) for row in rows) if lines else json.dumps(rows)
+
+    report = import_schedules(io.StringIO(text), 'json', chunk_size=3)
+
+    assert (report.imported, report.failed) == (8, 0)
+    assert stored_titles() == [row['title'] for row in rows]
+    assert get_connection().execute("SELECT is_active FROM schedules WHERE title = 'video 3'").fetchone() == (0,)
+
+def test_export_round_trips_through_import(db, tmp_path, monkeypatch):
+    rows = schedule_rows(4)
+    rows[0]['recurrence'] = 'cron:*/5 9-17 * * 1-5'
+    import_schedules(as_csv(rows), 'csv')
+    exported = io.StringIO()
+
+    assert export_schedules(exported, 'json') == 4
+
+    monkeypatch.setattr('database.connection.DB_PATH', str(tmp_path / 'copy.db'))
+    bulk.init_db()
+    report = import_schedules(io.StringIO(exported.getvalue()), 'json')
+    assert (report.imported, report.failed) == (4, 0)
+    assert get_connection().execute(
+        "SELECT recurrence FROM schedules WHERE title = 'video 0'").fetchone() == ('cron:*/5 9-17 * * 1-5',)
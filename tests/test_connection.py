@@ -0,0 +1,55 @@
+# tests/test_connection.py
+import threading
+
+from database import connection
+
+
+def in_thread(function):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=function()))
+    thread.start()
+    thread.join()
+    return result['value']
+
+
+def test_short_lived_threads_reuse_one_connection(db, monkeypatch):
+    opened = []
+    open_connection = connection.open_connection
+    monkeypatch.setattr(connection, 'open_connection',
+                        lambda *args, **kwargs: opened.append(args) or open_connection(*args, **kwargs))
+
+    # rerun마다 새 스레드
+    conns = [in_thread(connection.get_connection) for _ in range(5)]
+
+    assert len(opened) == 1
+    assert all(conn is conns[0] for conn in conns)
+
+def test_live_threads_get_their_own_connections(db):
+    started = threading.Barrier(3)
+    conns = []
+
+    def hold():
+        conns.append(connection.get_connection())
+        started.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(conn) for conn in conns + [connection.get_connection()]}) == 3
+
+def test_reused_connection_drops_an_unfinished_transaction(db):
+    def abandon():
+        conn = connection.get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("INSERT INTO videos (video_id, title) VALUES ('abc', 'abandoned')")
+        return conn
+
+    abandoned = in_thread(abandon)
+    reused = in_thread(connection.get_connection)
+
+    assert reused is abandoned and not reused.in_transaction
+    assert reused.execute("SELECT COUNT(*) FROM videos").fetchone()[0] == 0
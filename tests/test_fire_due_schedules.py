@@ -0,0 +1,107 @@
+# tests/test_fire_due_schedules.py
+import time as time_module
+
+from database.connection import get_connection, transaction
+from database.now_playing import now_playing
+from database.play_queue import play_queue
+from database.schedule_db import (
+    FIRE_LOG_RETENTION_SECONDS,
+    MISFIRE_GRACE_SECONDS,
+    add_schedule,
+    fire_due_schedules,
+    get_schedule,
+)
+from database.youtube_urls import embed_url
+
+# 실제 시각 근처의 회차 (재생 종료 시각은 실제 시계 기준이므로)
+OCCURRENCE = int(time_module.time()) // 60 * 60 - 60
+
+def schedule_video(video_id, title):
+    url = f'https://www.youtube.com/watch?v={video_id}'
+    add_schedule('09:00', url, 'youtube', title)
+    return get_connection().execute("SELECT id FROM schedules WHERE title = ?", (title,)).fetchone()[0], url
+
+def set_next_run(schedule_id, next_run_at):
+    with transaction() as conn:
+        conn.execute("UPDATE schedules SET next_run_at = ? WHERE id = ?", (next_run_at, schedule_id))
+
+def fire_log(schedule_id):
+    return get_connection().execute(
+        "SELECT occurrence, status FROM fire_log WHERE schedule_id = ?", (schedule_id,)).fetchall()
+
+
+def test_due_schedule_plays_and_advances(db):
+    schedule_id, url = schedule_video('aaaaaaaaaaa', 'first')
+    set_next_run(schedule_id, OCCURRENCE)
+
+    advanced = fire_due_schedules(now=OCCURRENCE + 10)
+
+    assert [schedule_id] == [row[0] for row in advanced]
+    assert advanced[0][1] > OCCURRENCE + 10
+    assert fire_log(schedule_id) == [(OCCURRENCE, 'queued')]
+    assert now_playing.current()['file_path'] == embed_url(url)
+    assert get_schedule(schedule_id).last_played is not None
+    # 같은 시각에 다시 돌려도 재생할 것이 없음
+    assert fire_due_schedules(now=OCCURRENCE + 10) == []
+
+def test_occurrence_fires_only_once(db):
+    schedule_id, _ = schedule_video('aaaaaaaaaaa', 'first')
+    set_next_run(schedule_id, OCCURRENCE)
+    fire_due_schedules(now=OCCURRENCE + 10)
+    version = now_playing.current()['version']
+
+    # 이미 재생한 회차로 되돌려도 (수정, 다른 스케줄러) 다시 재생하지 않고 다음 회차로만 넘김
+    set_next_run(schedule_id, OCCURRENCE)
+    advanced = fire_due_schedules(now=OCCURRENCE + 20)
+
+    assert [schedule_id] == [row[0] for row in advanced]
+    assert get_schedule(schedule_id).next_run_at > OCCURRENCE + 20
+    assert fire_log(schedule_id) == [(OCCURRENCE, 'queued')]
+    assert len(play_queue) == 0
+    assert now_playing.current()['version'] == version
+
+def test_occurrence_past_the_grace_window_is_missed(db):
+    schedule_id, _ = schedule_video('aaaaaaaaaaa', 'first')
+    now = OCCURRENCE + MISFIRE_GRACE_SECONDS + 60
+    set_next_run(schedule_id, OCCURRENCE)
+
+    fire_due_schedules(now=now)
+
+    assert fire_log(schedule_id) == [(OCCURRENCE, 'missed')]
+    assert now_playing.current() is None
+    assert len(play_queue) == 0
+    schedule = get_schedule(schedule_id)
+    assert schedule.next_run_at > now
+    assert schedule.last_played is None
+
+def test_late_occurrence_inside_the_grace_window_still_plays(db):
+    schedule_id, url = schedule_video('aaaaaaaaaaa', 'first')
+    set_next_run(schedule_id, OCCURRENCE)
+
+    fire_due_schedules(now=OCCURRENCE + MISFIRE_GRACE_SECONDS)
+
+    assert fire_log(schedule_id) == [(OCCURRENCE, 'queued')]
+    assert now_playing.current()['file_path'] == embed_url(url)
+
+def test_simultaneous_schedules_wait_in_the_queue(db):
+    first_id, first_url = schedule_video('aaaaaaaaaaa', 'first')
+    second_id, second_url = schedule_video('bbbbbbbbbbb', 'second')
+    set_next_run(first_id, OCCURRENCE)
+    set_next_run(second_id, OCCURRENCE)
+
+    fire_due_schedules(now=OCCURRENCE + 10)
+
+    assert now_playing.current()['file_path'] == embed_url(first_url)
+    assert [item['file_path'] for item in play_queue.items()] == [embed_url(second_url)]
+
+def test_tick_prunes_old_fire_log_rows(db):
+    now = OCCURRENCE + 10
+    old = now - FIRE_LOG_RETENTION_SECONDS - 60
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO fire_log (schedule_id, occurrence, fired_at, status) VALUES (?, ?, ?, ?)",
+            [(1, old, old, 'queued'), (1, now - 3600, now - 3600, 'queued')])
+
+    fire_due_schedules(now=now)
+
+    assert fire_log(1) == [(now - 3600, 'queued')]
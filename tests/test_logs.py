@@ -0,0 +1,30 @@
+# tests/test_logs.py
+import logging
+
+from monitoring.logs import RateLimitFilter
+
+
+def record(msg, *args, created=1000.0):
+    entry = logging.makeLogRecord({'name': 'database.schedule_db', 'levelno': logging.INFO, 'msg': msg,
+                                   'args': args})
+    entry.created = created
+    return entry
+
+
+def test_records_sharing_a_template_are_counted_separately():
+    rate_limit = RateLimitFilter(interval=60, burst=5)
+
+    passed = [rate_limit.filter(record("Playing video: %s", f"video {number}")) for number in range(20)]
+
+    assert all(passed)
+
+def test_repeated_message_is_suppressed_after_the_burst():
+    rate_limit = RateLimitFilter(interval=60, burst=5)
+
+    passed = [rate_limit.filter(record("Playing video: %s", "same")) for _ in range(20)]
+
+    assert passed.count(True) == 5
+    # 다음 구간의 첫 레코드가 건너뛴 수를 전달
+    next_window = record("Playing video: %s", "same", created=1061.0)
+    assert rate_limit.filter(next_window)
+    assert next_window.suppressed == 15
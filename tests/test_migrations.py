@@ -0,0 +1,98 @@
+# tests/test_migrations.py
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from database import connection
+from database.connection import get_connection
+from database.migrations import MIGRATIONS, migrate, schema_version
+from database.schedule_db import add_schedule, toggle_schedule
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# 이전 버전 스키마로 저장된 행 (중복 2개 포함)
+LEGACY_ROWS = [
+    ('09:00', 'https://youtu.be/dQw4w9WgXcQ', 'youtube', 'first'),
+    ('09:00', 'https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'youtube', 'same video and time'),
+    ('9:00', 'https://www.youtube.com/shorts/dQw4w9WgXcQ', 'youtube', 'same moment spelled differently'),
+    ('10:00', 'https://youtu.be/dQw4w9WgXcQ', 'youtube', 'other time'),
+    ('09:00', 'C:/videos/clip.mp4', 'local', 'local file'),
+    ('later', 'https://youtu.be/aaaaaaaaaaa', 'youtube', 'unparsable time'),
+]
+
+
+@pytest.fixture(params=['schedule.db', 'video_schedule.db'])
+def baseline_db(request, tmp_path, monkeypatch):
+    """A copy of one of the databases shipped with the repository, before any migration"""
+    path = tmp_path / request.param
+    shutil.copy(REPO_ROOT / request.param, path)
+    monkeypatch.setattr(connection, 'DB_PATH', str(path))
+    yield path
+    connection.close_connection()
+
+def insert_legacy_rows(path):
+    with sqlite3.connect(path) as conn:
+        conn.executemany("INSERT INTO schedules (schedule_time, file_path, file_type, title) VALUES (?, ?, ?, ?)",
+                         LEGACY_ROWS)
+    conn.close()
+
+def rows_by_title():
+    cursor = get_connection().execute(
+        "SELECT title, is_active, video_id, next_run_at, fire_key, category, recurrence FROM schedules")
+    return {row[0]: row[1:] for row in cursor}
+
+
+def test_baseline_databases_migrate_to_the_latest_version(baseline_db):
+    assert schema_version(get_connection()) == 0
+
+    assert migrate() == LATEST_VERSION
+
+    columns = {row[1] for row in get_connection().execute("PRAGMA table_info(schedules)")}
+    assert {'category', 'next_run_at', 'recurrence', 'video_id', 'fire_key'} <= columns
+    # 다시 실행해도 아무것도 바뀌지 않음
+    assert migrate() == LATEST_VERSION
+
+def test_legacy_rows_are_kept_and_duplicates_deactivated(baseline_db):
+    insert_legacy_rows(baseline_db)
+
+    migrate()
+
+    rows = rows_by_title()
+    assert len(rows) == len(LEGACY_ROWS)
+    assert {title for title, row in rows.items() if not row[0]} == {
+        'same video and time', 'same moment spelled differently'}
+    first = rows['first']
+    assert first[1] == 'dQw4w9WgXcQ'
+    assert first[2] is not None
+    assert first[3:] == ('daily 09:00', 'Music', 'daily')
+    assert rows['same moment spelled differently'][3] == 'daily 09:00'
+    assert rows['local file'][1] is None
+    # 해석할 수 없는 시간은 재생 예정 없이 그대로 남김
+    assert rows['unparsable time'][0] == 1
+    assert rows['unparsable time'][2] is None
+
+def test_migrated_database_rejects_new_duplicates(baseline_db):
+    insert_legacy_rows(baseline_db)
+    migrate()
+
+    with pytest.raises(ValueError):
+        add_schedule('09:00', 'https://youtube.com/embed/dQw4w9WgXcQ', 'youtube', 'duplicate')
+    # 다른 반복 규칙이면 같은 시간이라도 추가 가능
+    add_schedule('09:00', 'https://youtu.be/dQw4w9WgXcQ', 'youtube', 'mondays', recurrence='weekdays:0')
+    duplicate_id = get_connection().execute(
+        "SELECT id FROM schedules WHERE title = 'same video and time'").fetchone()[0]
+    with pytest.raises(ValueError):
+        toggle_schedule(duplicate_id, 1)
+
+def test_current_schema_takes_no_write_lock(db):
+    # 다른 연결이 쓰기 잠금을 잡고 있어도 바로 반환
+    writer = sqlite3.connect(db, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert migrate() == LATEST_VERSION
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
@@ -0,0 +1,102 @@
+# tests/test_play_queue.py
+from types import SimpleNamespace
+
+import pytest
+
+from database import now_playing as now_playing_module
+from database.connection import get_connection
+from database.now_playing import DEFAULT_PLAY_SECONDS, now_playing
+from database.play_queue import play_queue
+from monitoring.metrics import metrics
+
+START = 1_800_000_000
+
+
+@pytest.fixture
+def clock(db, monkeypatch):
+    """Wall clock used by now_playing.publish, moved by assigning clock.now"""
+    clock = SimpleNamespace(now=START)
+    monkeypatch.setattr(now_playing_module, 'time_module', SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+def enqueue(title, scheduled_at, duration_seconds=None):
+    play_queue.enqueue(title, title, scheduled_at=scheduled_at, duration_seconds=duration_seconds, schedule_id=1)
+
+def advance(clock, at):
+    clock.now = at
+    return play_queue.advance(at)
+
+def playing():
+    return now_playing.current()['title']
+
+
+def test_entries_due_together_play_one_after_another(clock):
+    enqueue('first', START)
+    enqueue('second', START)
+
+    assert advance(clock, START) == START + DEFAULT_PLAY_SECONDS
+    assert advance(clock, START + 60) == START + DEFAULT_PLAY_SECONDS
+    assert playing() == 'first'
+    advance(clock, START + DEFAULT_PLAY_SECONDS)
+    assert playing() == 'second'
+
+def test_later_schedule_replaces_a_video_of_unknown_length(clock):
+    enqueue('nine', START)
+    advance(clock, START)
+
+    enqueue('nine-oh-one', START + 60)
+    advance(clock, START + 60)
+
+    assert playing() == 'nine-oh-one'
+
+def test_later_schedule_waits_for_a_video_of_known_length(clock):
+    enqueue('long', START, duration_seconds=3600)
+    advance(clock, START)
+
+    enqueue('next', START + 60)
+
+    assert advance(clock, START + 60) == START + 3600
+    assert playing() == 'long'
+
+def test_entry_already_due_when_a_video_started_waits_for_it(clock):
+    enqueue('first', START)
+    enqueue('second', START)
+    advance(clock, START)
+    # 09:01 항목이 first를 이어받을 때 같은 순간(09:00)의 second가 먼저 시작
+    enqueue('third', START + 60)
+    advance(clock, START + 60)
+    assert playing() == 'second'
+
+    assert advance(clock, START + 90) == START + 60 + DEFAULT_PLAY_SECONDS
+    assert playing() == 'second'
+
+def test_skip_plays_the_next_entry_or_stops(clock):
+    enqueue('first', START, duration_seconds=3600)
+    enqueue('second', START, duration_seconds=3600)
+    advance(clock, START)
+
+    play_queue.advance(START + 10, skip=True)
+    assert playing() == 'second'
+    play_queue.advance(START + 20, skip=True)
+    assert now_playing.current() is None
+
+def fire_lag_totals():
+    samples = {name: value for name, _, value in metrics.get('scheduler_fire_lag_seconds').samples()}
+    return samples['scheduler_fire_lag_seconds_count'], samples['scheduler_fire_lag_seconds_sum']
+
+def test_fire_lag_is_recorded_when_the_entry_starts(clock):
+    enqueue('long', START, duration_seconds=300)
+    enqueue('queued', START, duration_seconds=300)
+    advance(clock, START)
+    count, total = fire_lag_totals()
+
+    advance(clock, START + 300)
+
+    assert playing() == 'queued'
+    assert fire_lag_totals() == (count + 1, total + 300)
+
+def test_preemption_check_uses_an_index(db):
+    plan = get_connection().execute(
+        "EXPLAIN QUERY PLAN SELECT 1 FROM play_queue WHERE scheduled_at > ? LIMIT 1", (START,)).fetchall()
+
+    assert 'idx_play_queue_scheduled_at' in plan[0][3]
@@ -0,0 +1,84 @@
+# tests/test_recurrence.py
+from datetime import datetime
+
+import pytest
+
+from database.recurrence import compile_rule, fire_key, following_fire_time, next_fire_time
+
+
+def next_at(schedule_time, now, recurrence):
+    fire_at = next_fire_time(schedule_time, now, recurrence)
+    return datetime.fromtimestamp(fire_at) if fire_at is not None else None
+
+
+# 2026-10-19는 월요일
+MONDAY = datetime(2026, 10, 19)
+
+
+def test_daily_counts_the_current_minute():
+    assert next_at('09:00', MONDAY.replace(hour=9, second=30), 'daily') == datetime(2026, 10, 19, 9, 0)
+    assert next_at('09:00', MONDAY.replace(hour=9, minute=1), 'daily') == datetime(2026, 10, 20, 9, 0)
+
+def test_weekdays_skip_to_the_next_selected_day():
+    assert next_at('09:00', datetime(2026, 10, 20, 12), 'weekdays:0,4') == datetime(2026, 10, 23, 9, 0)
+    # "weekdays"만 쓰면 월~금 - 토요일 다음은 월요일
+    assert next_at('09:00', datetime(2026, 10, 24, 12), 'weekdays') == datetime(2026, 10, 26, 9, 0)
+
+def test_date_fires_once():
+    assert next_at('09:00', datetime(2026, 10, 20, 8), 'date:2026-10-20') == datetime(2026, 10, 20, 9, 0)
+    assert next_at('09:00', datetime(2026, 10, 20, 12), 'date:2026-10-20') is None
+
+def test_every_stops_at_midnight_and_restarts_at_the_start_time():
+    assert next_at('22:00', MONDAY.replace(hour=1), 'every:30') == datetime(2026, 10, 19, 22, 0)
+    assert next_at('22:00', MONDAY.replace(hour=22, minute=31), 'every:30') == datetime(2026, 10, 19, 23, 0)
+    assert next_at('23:30', MONDAY.replace(hour=23, minute=46), 'every:15') == datetime(2026, 10, 20, 23, 30)
+    # 23:00 + 3 * 25분은 자정을 넘으므로 00:15가 아니라 다음 날 23:00
+    assert next_at('23:00', MONDAY.replace(hour=23, minute=51), 'every:25') == datetime(2026, 10, 20, 23, 0)
+
+def test_cron_day_of_month_or_day_of_week():
+    # 일과 요일이 모두 지정되면 둘 중 하나만 맞아도 실행 (1일 또는 월요일)
+    assert next_at('00:00', datetime(2026, 10, 20, 10), 'cron:0 9 1 * 1') == datetime(2026, 10, 26, 9, 0)
+    assert next_at('00:00', datetime(2026, 10, 27, 10), 'cron:0 9 1 * 1') == datetime(2026, 11, 1, 9, 0)
+
+def test_cron_wildcard_field_restricts_with_and():
+    assert next_at('00:00', datetime(2026, 10, 27, 10), 'cron:0 9 * * 1') == datetime(2026, 11, 2, 9, 0)
+    assert next_at('00:00', datetime(2026, 10, 27, 10), 'cron:0 9 1 * *') == datetime(2026, 11, 1, 9, 0)
+
+def test_cron_sunday_is_zero_or_seven():
+    expected = datetime(2026, 10, 25, 8, 30)
+    assert next_at('00:00', MONDAY, 'cron:30 8 * * 0') == expected
+    assert next_at('00:00', MONDAY, 'cron:30 8 * * 7') == expected
+
+def test_cron_finds_rare_dates():
+    assert next_at('00:00', datetime(2026, 3, 1), 'cron:0 0 29 2 *') == datetime(2028, 2, 29, 0, 0)
+
+def test_cron_steps_and_ranges():
+    assert next_at('00:00', MONDAY.replace(hour=17, minute=56), 'cron:*/5 9-17 * * 1-5') == datetime(2026, 10, 20, 9, 0)
+
+@pytest.mark.parametrize('recurrence, schedule_time', [
+    ('hourly', '09:00'),
+    ('daily', '25:00'),
+    ('weekdays:7', '09:00'),
+    ('weekdays:', '09:00'),
+    ('every:0', '09:00'),
+    ('date:2026-13-01', '09:00'),
+    ('cron:0 9 * *', '09:00'),
+    ('cron:60 9 * * *', '09:00'),
+])
+def test_invalid_rules_are_rejected(recurrence, schedule_time):
+    with pytest.raises(ValueError):
+        compile_rule(recurrence, schedule_time)
+    assert next_fire_time(schedule_time, MONDAY, recurrence) is None
+
+def test_following_fire_time_skips_occurrences_already_in_the_past():
+    run_at = int(datetime(2026, 10, 19, 9, 0).timestamp())
+    now = int(datetime(2026, 10, 19, 10, 7).timestamp())
+    following = following_fire_time('09:00', run_at, now, 'every:15')
+    assert datetime.fromtimestamp(following) == datetime(2026, 10, 19, 10, 15)
+
+def test_fire_key_treats_equivalent_spellings_as_one_rule():
+    assert fire_key('weekdays:0,1,2,3,4,5,6', '9:00') == fire_key('daily', '09:00') == 'daily 09:00'
+    assert fire_key('weekdays:4,0', '09:00') == fire_key('weekdays:0,4', '09:00')
+    assert fire_key('cron:0  9 * *   1', '09:00') == fire_key('cron:0 9 * * 1', '23:00')
+    assert fire_key('weekdays:0', '09:00') != fire_key('daily', '09:00')
+    assert fire_key('every:15', '09:00') != fire_key('every:30', '09:00')
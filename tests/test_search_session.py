@@ -0,0 +1,136 @@
+# tests/test_search_session.py
+import json
+
+import pytest
+
+from benchmarks import fake_youtube
+from benchmarks.fake_youtube import FakeSearch, fake_video_id
+from youtube import search, search_session
+from youtube.search_cache import SearchCache
+from youtube.search_session import SearchSessionRegistry
+
+
+def expected_ids(start, count, query='lofi Music'):
+    return [fake_video_id(f"{query}#{index}") for index in range(start, start + count)]
+
+def ids(videos):
+    return [video['videoId'] for video in videos]
+
+
+@pytest.fixture
+def pulled(db, monkeypatch):
+    """Number of fake results pulled so far, with fresh search sessions and cache"""
+    counter = {'count': 0}
+    make_video = fake_youtube.fake_video
+
+    def counting_video(query, index):
+        counter['count'] += 1
+        return make_video(query, index)
+
+    monkeypatch.setattr(fake_youtube, 'fake_video', counting_video)
+    monkeypatch.setattr(search, 'search_cache', SearchCache(search.fetch_videos))
+    use_registry(monkeypatch, SearchSessionRegistry(source=FakeSearch))
+    return lambda: counter['count']
+
+def use_registry(monkeypatch, registry):
+    monkeypatch.setattr(search_session, 'search_sessions', registry)
+    monkeypatch.setattr(search, 'search_sessions', registry)
+
+
+def test_load_more_resumes_the_first_search(pulled):
+    first = search.search_videos('lofi', 'Music')
+    assert (ids(first), pulled()) == (expected_ids(0, 20), 20)
+
+    more = search_session.load_more('lofi', 'Music', len(first))
+
+    assert (ids(more), pulled()) == (expected_ids(20, 20), 40)
+
+def test_cached_search_scrapes_nothing(pulled):
+    search.search_videos('lofi', 'Music')
+    search.search_videos('  LOFI ', 'Music')
+
+    assert pulled() == 20
+
+def test_load_more_after_a_cache_hit_resumes_without_a_live_session(pulled, monkeypatch):
+    first = search.search_videos('lofi', 'Music')
+    # 세션이 유휴 시간으로 제거되었거나 프로세스가 다시 시작된 경우
+    use_registry(monkeypatch, SearchSessionRegistry(source=FakeSearch))
+    assert search.search_videos('lofi', 'Music') == first
+
+    more = search_session.load_more('lofi', 'Music', len(first))
+
+    assert (ids(more), pulled()) == (expected_ids(20, 20), 40)
+
+def test_expired_continuation_restarts_the_search(pulled, monkeypatch):
+    first = search.search_videos('lofi', 'Music')
+
+    def rejected():
+        raise ValueError("continuation expired")
+        yield
+
+    def expired(search_query, category, continuation=None):
+        return rejected() if continuation is not None else FakeSearch(search_query, category)
+
+    use_registry(monkeypatch, SearchSessionRegistry(source=expired))
+    more = search_session.load_more('lofi', 'Music', len(first))
+
+    assert (ids(more), pulled()) == (expected_ids(20, 20), 60)
+
+def test_refresh_starts_a_new_session(pulled):
+    first = search.search_videos('lofi', 'Music')
+    session = search_session.search_sessions.get('lofi', 'Music')
+
+    search.search_cache.invalidate('lofi', 'Music')
+    again = search.search_videos('lofi', 'Music')
+
+    assert search_session.search_sessions.get('lofi', 'Music') is not session
+    assert ids(again) == ids(first)
+
+
+def youtube_page(video_ids, next_token=None):
+    page = {'contents': [{'videoRenderer': {'videoId': video_id}} for video_id in video_ids]}
+    if next_token:
+        page['continuationEndpoint'] = {'continuationCommand': {'token': next_token}, 'clickTrackingParams': 'ct'}
+    return page
+
+@pytest.fixture
+def youtube(monkeypatch):
+    """Fake YouTube pages behind the scrapetube helpers, recording the requests made"""
+    requests = []
+    first_page = {'contents': youtube_page(['a', 'b', 'c'], next_token='page-2')}
+    pages = {'page-2': youtube_page(['d', 'e'])}
+    html = {'INNERTUBE_CONTEXT': '{"client": {"clientVersion": "1', 'innertubeApiKey': 'key',
+            'var ytInitialData = ': json.dumps(first_page)[:-1]}
+
+    def initial_data(session, url):
+        requests.append('first')
+        return 'html'
+
+    def ajax_data(session, endpoint, api_key, next_data, client):
+        requests.append(next_data['token'])
+        return pages[next_data['token']]
+
+    monkeypatch.setattr(search_session, 'get_initial_data', initial_data)
+    monkeypatch.setattr(search_session, 'get_json_from_html', lambda text, key, *args: html[key])
+    monkeypatch.setattr(search_session, 'get_ajax_data', ajax_data)
+    monkeypatch.setattr(search_session, 'PAGE_SLEEP_SECONDS', 0)
+    return requests
+
+def test_scrapetube_search_resumes_from_its_continuation(youtube):
+    results = search_session.ScrapetubeSearch('lofi', 'Music')
+    assert [next(results)['videoId'] for _ in range(2)] == ['a', 'b']
+    assert results.continuation['page'] is None and results.continuation['skip'] == 2
+
+    # 첫 페이지 중간부터 - 첫 페이지만 다시 요청
+    resumed = search_session.ScrapetubeSearch('lofi', 'Music', results.continuation)
+    assert [video['videoId'] for video in resumed] == ['c', 'd', 'e']
+    assert resumed.continuation == {'done': True}
+    assert youtube == ['first', 'first', 'page-2']
+
+    # 첫 페이지를 다 읽었으면 다음 페이지 토큰부터
+    youtube.clear()
+    results = search_session.ScrapetubeSearch('lofi', 'Music')
+    assert [next(results)['videoId'] for _ in range(3)] == ['a', 'b', 'c']
+    resumed = search_session.ScrapetubeSearch('lofi', 'Music', results.continuation)
+    assert [video['videoId'] for video in resumed] == ['d', 'e']
+    assert youtube == ['first', 'page-2']
@@ -0,0 +1,57 @@
+# tests/test_wake_channel.py
+import subprocess
+import os
+import sys
+import time as time_module
+
+import pytest
+
+from database import scheduler, wake_channel
+
+ADD_SCHEDULE = '''
+import sys
+from database import connection
+from database.schedule_db import add_schedule
+connection.set_db_path(sys.argv[1])
+add_schedule('09:00', 'C:/video.mp4', 'local', 'from another process')
+'''
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time_module.monotonic() + timeout
+    while time_module.monotonic() < deadline:
+        if condition():
+            return True
+        time_module.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def engine(db):
+    status = scheduler.start_scheduler()
+    assert status['state'] == 'running'
+    yield scheduler._engine
+    scheduler.stop_scheduler()
+
+def test_schedule_added_by_another_process_wakes_the_engine(engine, db, monkeypatch):
+    # data_version 확인 주기보다 훨씬 빨리 반영되어야 함
+    monkeypatch.setattr(scheduler, 'CHANGE_CHECK_SECONDS', 60)
+    assert wait_for(lambda: engine._version is not None)
+    assert engine.next_fire_at() is None
+
+    started = time_module.monotonic()
+    subprocess.run([sys.executable, '-c', ADD_SCHEDULE, db], check=True,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    assert wait_for(lambda: engine.next_fire_at() is not None)
+    assert time_module.monotonic() - started < 5
+
+def test_wake_without_a_listener_is_a_no_op(db):
+    assert wake_channel.wake() is False
+
+def test_stopped_scheduler_removes_its_port_file(engine, db):
+    assert wake_channel._store().read()['port']
+
+    scheduler.stop_scheduler()
+
+    assert wake_channel._store().read() is None
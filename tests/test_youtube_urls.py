@@ -0,0 +1,44 @@
+# tests/test_youtube_urls.py
+import pytest
+
+from database.youtube_urls import embed_url, video_id, watch_url
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+
+
+@pytest.mark.parametrize('url', [
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+    'https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=10',
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ#t=3',
+    'https://m.youtube.com/watch?v=dQw4w9WgXcQ',
+    'https://music.youtube.com/watch?v=dQw4w9WgXcQ',
+    'youtu.be/dQw4w9WgXcQ?t=5',
+    'https://www.youtube.com/embed/dQw4w9WgXcQ',
+    'https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ?autoplay=1',
+    'https://www.youtube.com/v/dQw4w9WgXcQ',
+    'https://youtube.com/shorts/dQw4w9WgXcQ',
+    'https://www.youtube.com/live/dQw4w9WgXcQ?si=abc',
+    'HTTPS://WWW.YOUTUBE.COM/watch?v=dQw4w9WgXcQ',
+    '  https://youtu.be/dQw4w9WgXcQ  ',
+])
+def test_every_supported_form_gives_the_same_id(url):
+    assert video_id(url) == VIDEO_ID
+
+@pytest.mark.parametrize('url', [
+    'https://www.youtube.com/watch?v=short',
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQextra',
+    'https://www.youtube.com/watch?list=PL1&vv=dQw4w9WgXcQ',
+    'https://www.youtube.com/channel/UCabcdefghijk',
+    'https://notyoutube.com/watch?v=dQw4w9WgXcQ',
+    'https://example.com/?u=https://youtu.be/dQw4w9WgXcQ',
+    'dQw4w9WgXcQ',
+    '',
+    None,
+    123,
+])
+def test_anything_else_is_not_a_video(url):
+    assert video_id(url) is None
+
+def test_canonical_urls_parse_back_to_their_id():
+    assert video_id(watch_url(VIDEO_ID)) == VIDEO_ID
+    assert video_id(embed_url(watch_url(VIDEO_ID))) == VIDEO_ID
@@ -0,0 +1,58 @@
+# youtube/search.py
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from youtube.search_cache import SearchCache
+from youtube.search_session import search_sessions
+
+# 캐시에 없거나 오래된 검색은 새 검색 세션으로 가져옴 ("더 보기"가 같은 위치에서 이어서 가져옴)
+def fetch_videos(search_query, category, limit=20):
+    """Scrape the first page of a search through a new shared SearchSession.
+
+    Where these results end is saved with the session, so "더 보기" resumes
+    after them even when the cached page is served much later.
+    """
+    return search_sessions.first_page(search_query, category, limit)
+
+# 프로세스 전역 검색 캐시 (모든 세션이 공유)
+search_cache = SearchCache(fetch_videos)
+
+# 여러 카테고리 동시 검색에 쓰는 스레드 수 (모든 세션이 공유하므로 외부 요청 수가 제한됨)
+SEARCH_WORKERS = 4
+_search_pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix='search')
+
+def search_videos(search_query, category, limit=20):
+    """Search YouTube through the shared cache"""
+    results = search_cache.get(search_query, category, limit)
+    # 캐시 키는 정규화된 검색어이므로 표시용 검색어는 이번 요청 기준으로 설정
+    return [dict(video, search_query=search_query) for video in results]
+
+def search_categories(search_query, categories, limit=20):
+    """Search several categories in parallel and yield results as each category finishes.
+
+    Yields (category, videos, error) tuples in completion order. Videos whose
+    videoId was already yielded for another category are left out, so the
+    concatenation of all batches is deduplicated.
+    """
+    futures = {
+        _search_pool.submit(search_videos, search_query, category, limit): category
+        for category in categories
+    }
+    seen = set()
+    try:
+        for future in as_completed(futures):
+            category = futures[future]
+            try:
+                videos = future.result()
+            except Exception as e:
+                yield category, [], e
+                continue
+            fresh = []
+            for video in videos:
+                if video['videoId'] not in seen:
+                    seen.add(video['videoId'])
+                    fresh.append(video)
+            yield category, fresh, None
+    finally:
+        # 호출자가 중간에 멈추면 아직 시작하지 않은 검색은 취소
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,145 @@
+# youtube/search_cache.py
+import json
+import logging
+import threading
+import time as time_module
+from collections import OrderedDict
+
+from database.connection import get_connection, transaction
+from monitoring.metrics import metrics
+from youtube.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# 캐시 유효 시간 (초) - 이 시간 안의 결과는 그대로 사용
+SEARCH_TTL_SECONDS = 30 * 60
+# 유효 시간이 지난 뒤에도 이 시간까지는 이전 결과를 바로 보여주고 백그라운드에서 갱신
+SEARCH_STALE_SECONDS = 24 * 60 * 60
+# 메모리에 보관할 검색어 수
+SEARCH_CACHE_ENTRIES = 256
+
+# 검색 지표 (응답 시간, 캐시 적중률)
+_search_seconds = metrics.histogram('search_seconds', "Time to answer a search from the cache or YouTube")
+_fetch_seconds = metrics.histogram('search_fetch_seconds', "Time to scrape one search from YouTube")
+_cache_hits = metrics.counter('search_cache_hits_total', "Searches answered with fresh cached results")
+_cache_stale_hits = metrics.counter('search_cache_stale_hits_total', "Searches answered with stale results while refreshing")
+_cache_misses = metrics.counter('search_cache_misses_total', "Searches that waited for YouTube")
+
+def cache_key(query, category, limit):
+    """Normalize a search into its cache key (case and whitespace insensitive)"""
+    normalized = " ".join(str(query).lower().split())
+    return f"{normalized}\x1f{category or ''}\x1f{int(limit)}"
+
+
+class SearchCache:
+    """Two-tier cache for search results: in-memory LRU in front of a SQLite table.
+
+    Fresh entries (younger than ttl) are returned as-is. Stale entries
+    (younger than stale_ttl) are returned immediately while a background
+    thread refreshes them. Anything older is fetched synchronously.
+    Concurrent fetches of the same key, from any session, share one call.
+    """
+
+    def __init__(self, fetch, max_entries=SEARCH_CACHE_ENTRIES, ttl=SEARCH_TTL_SECONDS,
+                 stale_ttl=SEARCH_STALE_SECONDS, persist=True):
+        self.fetch = fetch
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.persist = persist
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._flight = SingleFlight()
+
+    def get(self, query, category, limit=20):
+        """Return cached results for the search, fetching or refreshing as needed"""
+        with _search_seconds.time():
+            key = cache_key(query, category, limit)
+            entry = self._lookup(key)
+            if entry is not None:
+                results, fetched_at = entry
+                age = time_module.time() - fetched_at
+                if age < self.ttl:
+                    _cache_hits.inc()
+                    return results
+                if age < self.stale_ttl:
+                    _cache_stale_hits.inc()
+                    self._refresh_in_background(key, query, category, limit)
+                    return results
+            _cache_misses.inc()
+            return self._fetch_and_store(key, query, category, limit)
+
+    def invalidate(self, query=None, category=None, limit=20):
+        """Drop one search from both tiers, or everything when query is None"""
+        with self._lock:
+            if query is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(cache_key(query, category, limit), None)
+        if self.persist:
+            with transaction() as conn:
+                if query is None:
+                    conn.execute("DELETE FROM search_cache")
+                else:
+                    conn.execute("DELETE FROM search_cache WHERE cache_key = ?", (cache_key(query, category, limit),))
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        if not self.persist:
+            return None
+        row = get_connection().execute(
+            "SELECT results, fetched_at FROM search_cache WHERE cache_key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = (json.loads(row[0]), row[1])
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _fetch_and_store(self, key, query, category, limit):
+        # 같은 검색이 이미 진행 중이면 그 결과를 함께 받음
+        return self._flight.do(key, self._fetch_uncoalesced, key, query, category, limit)
+
+    def _fetch_uncoalesced(self, key, query, category, limit):
+        with _fetch_seconds.time():
+            results = self.fetch(query, category, limit)
+        fetched_at = int(time_module.time())
+        self._remember(key, (results, fetched_at))
+        if self.persist:
+            with transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_cache (cache_key, results, fetched_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(results, ensure_ascii=False), fetched_at),
+                )
+                # 오래된 항목 정리 (영구 캐시 크기 제한)
+                conn.execute("DELETE FROM search_cache WHERE fetched_at < ?", (fetched_at - self.stale_ttl,))
+        return results
+
+    def _refresh_in_background(self, key, query, category, limit):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch_and_store(key, query, category, limit)
+            except Exception:
+                logger.exception("Search cache refresh error")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name='search-cache-refresh', daemon=True).start()
@@ -0,0 +1,301 @@
+# youtube/search_session.py
+import json
+import logging
+import threading
+import time as time_module
+from collections import OrderedDict
+
+from scrapetube.scrapetube import (
+    get_ajax_data,
+    get_initial_data,
+    get_json_from_html,
+    get_next_data,
+    get_session,
+    search_dict,
+)
+
+from database.connection import get_connection, transaction
+from database.videos import parse_view_count, upsert_videos
+from database.youtube_urls import watch_url
+from youtube.search_cache import SEARCH_STALE_SECONDS, cache_key
+
+logger = logging.getLogger(__name__)
+
+# "더 보기" 한 번에 가져올 결과 수
+PAGE_SIZE = 20
+# 이 시간 동안 사용하지 않은 검색 세션은 제거 (초)
+SESSION_IDLE_SECONDS = 10 * 60
+# 동시에 유지할 최대 검색 세션 수
+MAX_SESSIONS = 64
+# 저장된 이어받기 위치를 쓰는 기간 (초) - 검색 캐시가 이전 결과를 보여주는 기간과 같음
+SESSION_STATE_SECONDS = SEARCH_STALE_SECONDS
+
+# scrapetube.get_search와 같은 검색 주소 (관련도순, 동영상만)와 다음 페이지 API
+SEARCH_URL = "https://www.youtube.com/results?search_query={query}&sp=CAASAhAB"
+SEARCH_API = "https://www.youtube.com/youtubei/v1/search"
+# 다음 페이지 요청 사이 대기 시간 (초) - scrapetube 기본값과 같음
+PAGE_SLEEP_SECONDS = 1
+
+# scrapetube 검색 결과를 앱에서 쓰는 video_data 형식으로 변환
+def build_video_data(video, category, search_query):
+    video_id = video.get('videoId')
+    if not video_id:
+        return None
+    return {
+        'title': video.get('title', {}).get('runs', [{}])[0].get('text', 'No Title'),
+        'link': watch_url(video_id),
+        'videoId': video_id,
+        'thumbnails': [{'url': f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg'}],
+        'channel': {
+            'name': video.get('longBylineText', {}).get('runs', [{}])[0].get('text', 'Unknown')
+        },
+        'duration': video.get('lengthText', {}).get('simpleText', 'N/A'),
+        'viewCount': {
+            'short': video.get('shortViewCountText', {}).get('simpleText', 'N/A'),
+            'value': parse_view_count(video.get('viewCountText', {}).get('simpleText'))
+        },
+        'category': category,
+        'search_query': search_query
+    }
+
+# 검색 결과 메타데이터를 videos 테이블에 일괄 저장 (실패해도 검색은 계속)
+def save_video_metadata(videos):
+    try:
+        upsert_videos(videos)
+    except Exception:
+        logger.exception("Video metadata save error")
+
+
+class ScrapetubeSearch:
+    """scrapetube search results that can be resumed from a saved continuation.
+
+    Iterates over the same video renderers as scrapetube.get_search. After
+    each item, ``continuation`` points at the next one: the page token
+    (None for the first page), the API key and client context needed to
+    request it, and how many of that page's items were already yielded.
+    It is plain JSON, so another session or process can pass it back to
+    continue the search without scraping the earlier pages again.
+    """
+
+    def __init__(self, search_query, category, continuation=None):
+        self.query = f"{search_query} {category}"
+        self.continuation = continuation
+        self._items = self._iter_items()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._items)
+
+    def _iter_items(self):
+        state = self.continuation or {'page': None, 'skip': 0}
+        if state.get('done'):
+            return
+        session = get_session()
+        try:
+            page, skip = state['page'], state['skip']
+            api_key, client = state.get('api_key'), state.get('client')
+            requested = False
+            while True:
+                if page is None:
+                    html = get_initial_data(session, SEARCH_URL.format(query=self.query))
+                    client = json.loads(get_json_from_html(html, "INNERTUBE_CONTEXT", 2, '"}},') + '"}}')["client"]
+                    api_key = get_json_from_html(html, "innertubeApiKey", 3)
+                    data = json.loads(get_json_from_html(html, "var ytInitialData = ", 0, "};") + "}")
+                    data = next(search_dict(data, "contents"), None)
+                else:
+                    if requested:
+                        time_module.sleep(PAGE_SLEEP_SECONDS)
+                    session.headers["X-YouTube-Client-Name"] = "1"
+                    session.headers["X-YouTube-Client-Version"] = client["clientVersion"]
+                    data = get_ajax_data(session, SEARCH_API, api_key, page, client)
+                requested = True
+                next_page = get_next_data(data)
+                items = list(search_dict(data, "videoRenderer"))
+                for index in range(skip, len(items)):
+                    if index + 1 < len(items):
+                        self.continuation = {'page': page, 'skip': index + 1, 'api_key': api_key, 'client': client}
+                    elif next_page:
+                        self.continuation = {'page': next_page, 'skip': 0, 'api_key': api_key, 'client': client}
+                    else:
+                        self.continuation = {'done': True}
+                    yield items[index]
+                if not next_page:
+                    self.continuation = {'done': True}
+                    return
+                page, skip = next_page, 0
+        finally:
+            session.close()
+
+
+class SearchSession:
+    """Keeps a lazy search iterator alive so later pages resume where it stopped.
+
+    A session may start part-way through a search (``position`` results
+    were delivered earlier, possibly by another process); asking for
+    anything before that restarts the search from the first result.
+    """
+
+    def __init__(self, search_query, category, source=ScrapetubeSearch, state=None):
+        self.search_query = search_query
+        self.category = category
+        self.results = []
+        self.exhausted = False
+        self.last_used = time_module.monotonic()
+        self.position = 0
+        self._source = source
+        self._seen = set()
+        self._lock = threading.Lock()
+        if state is None:
+            self._iterator = source(search_query, category)
+        else:
+            self.position = state['position']
+            self._seen = set(state['seen'])
+            self._iterator = source(search_query, category, state['continuation'])
+
+    @property
+    def continuation(self):
+        return getattr(self._iterator, 'continuation', None)
+
+    def state(self):
+        """JSON-serializable position of this session, accepted back as state="""
+        with self._lock:
+            return {'position': self.position + len(self.results), 'seen': sorted(self._seen),
+                    'continuation': self.continuation}
+
+    def fetch(self, start, count=PAGE_SIZE):
+        """Return results[start:start + count], pulling only the items not fetched yet"""
+        with self._lock:
+            self.last_used = time_module.monotonic()
+            if start < self.position:
+                # 이어받은 위치보다 앞부분 - 처음부터 다시 가져옴
+                self._restart()
+            fetched = len(self.results)
+            while not self.exhausted and self.position + len(self.results) < start + count:
+                try:
+                    video = next(self._iterator)
+                except StopIteration:
+                    self.exhausted = True
+                    break
+                except Exception:
+                    if self.position == 0 or self.results:
+                        raise
+                    # 저장된 위치가 만료됨 (토큰 유효 기간 등) - 처음부터 다시 가져옴
+                    logger.warning("Search continuation failed, restarting: %s %s", self.search_query, self.category)
+                    self._restart()
+                    continue
+                video_data = build_video_data(video, self.category, self.search_query)
+                if video_data and video_data['videoId'] not in self._seen:
+                    self._seen.add(video_data['videoId'])
+                    self.results.append(video_data)
+            if len(self.results) > fetched:
+                save_video_metadata(self.results[fetched:])
+            begin = start - self.position
+            return self.results[begin:begin + count]
+
+    def _restart(self):
+        self.position = 0
+        self.results = []
+        self.exhausted = False
+        self._seen = set()
+        self._iterator = self._source(self.search_query, self.category)
+
+
+class SearchSessionRegistry:
+    """Process-wide search sessions keyed by normalized (query, category), evicted when idle.
+
+    Where the first page of each search ends is also saved in the
+    search_sessions table, so a search answered from the search cache
+    (even one cached by another process, or before a restart) resumes
+    after those results when "더 보기" is used, instead of scraping the
+    first page again.
+    """
+
+    def __init__(self, idle_seconds=SESSION_IDLE_SECONDS, max_sessions=MAX_SESSIONS, source=ScrapetubeSearch,
+                 persist=True):
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self.source = source
+        self.persist = persist
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, search_query, category):
+        key = cache_key(search_query, category, 0)
+        with self._lock:
+            self._evict_idle()
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._store(key, SearchSession(search_query, category, self.source, self._load_state(key)))
+            self._sessions.move_to_end(key)
+            return session
+
+    def start(self, search_query, category):
+        """Open a new session for the search, replacing any live one (results are scraped again)"""
+        key = cache_key(search_query, category, 0)
+        with self._lock:
+            self._evict_idle()
+            return self._store(key, SearchSession(search_query, category, self.source))
+
+    def first_page(self, search_query, category, count=PAGE_SIZE):
+        """Scrape the first results of a search in a new session and save where they end"""
+        session = self.start(search_query, category)
+        results = session.fetch(0, count)
+        self._save_state(cache_key(search_query, category, 0), session)
+        return results
+
+    def load_more(self, search_query, category, already_loaded, count=PAGE_SIZE):
+        """Return the page that follows the first already_loaded results (empty when exhausted)"""
+        return self.get(search_query, category).fetch(already_loaded, count)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def _store(self, key, session):
+        self._sessions[key] = session
+        self._sessions.move_to_end(key)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return session
+
+    def _evict_idle(self):
+        deadline = time_module.monotonic() - self.idle_seconds
+        for key in [key for key, session in self._sessions.items() if session.last_used < deadline]:
+            del self._sessions[key]
+
+    def _load_state(self, key):
+        if not self.persist:
+            return None
+        row = get_connection().execute(
+            "SELECT position, seen, continuation FROM search_sessions WHERE session_key = ? AND updated_at >= ?",
+            (key, int(time_module.time()) - SESSION_STATE_SECONDS),
+        ).fetchone()
+        if row is None or row[2] is None:
+            return None
+        return {'position': row[0], 'seen': json.loads(row[1]), 'continuation': json.loads(row[2])}
+
+    def _save_state(self, key, session):
+        if not self.persist:
+            return
+        state = session.state()
+        if state['continuation'] is None:
+            return
+        updated_at = int(time_module.time())
+        with transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_sessions (session_key, position, seen, continuation, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, state['position'], json.dumps(state['seen']), json.dumps(state['continuation']), updated_at),
+            )
+            # 오래된 위치 정리 (YouTube 토큰도 그 사이 만료됨)
+            conn.execute("DELETE FROM search_sessions WHERE updated_at < ?", (updated_at - SESSION_STATE_SECONDS,))
+
+
+# 프로세스 전역 검색 세션 (모든 Streamlit 세션이 공유)
+search_sessions = SearchSessionRegistry()
+
+def load_more(search_query, category, already_loaded, count=PAGE_SIZE):
+    """Fetch the next page of a search, resuming where it stopped instead of starting over"""
+    return search_sessions.load_more(search_query, category, already_loaded, count)
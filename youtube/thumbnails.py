@@ -0,0 +1,171 @@
+# youtube/thumbnails.py
+import io
+import logging
+import os
+import threading
+import time as time_module
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from database.youtube_urls import is_video_id
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow가 없으면 YouTube의 작은 썸네일을 직접 받음
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# 썸네일 캐시 디렉터리와 최대 크기
+THUMBNAIL_DIR = os.path.join('.cache', 'thumbnails')
+THUMBNAIL_CACHE_BYTES = 64 * 1024 * 1024
+THUMBNAIL_BASE_URL = 'https://i.ytimg.com/vi'
+FETCH_TIMEOUT = 5
+FETCH_WORKERS = 8
+# 받기에 실패한 썸네일은 이 시간 동안 다시 시도하지 않음 (초)
+FAILURE_RETRY_SECONDS = 5 * 60
+
+# 변형별 (최대 너비, Pillow가 없을 때 받을 YouTube 원본 파일)
+VARIANTS = {
+    'small': (240, 'mqdefault.jpg'),
+    'large': (None, 'hqdefault.jpg'),
+}
+
+def fetch_url(url, timeout=FETCH_TIMEOUT):
+    """Default fetcher: download url and return its bytes"""
+    request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+def _resize(data, max_width):
+    with Image.open(io.BytesIO(data)) as image:
+        if image.width <= max_width:
+            return data
+        height = round(image.height * max_width / image.width)
+        resized = image.convert('RGB').resize((max_width, height), Image.LANCZOS)
+        output = io.BytesIO()
+        resized.save(output, format='JPEG', quality=85, optimize=True)
+        return output.getvalue()
+
+
+class ThumbnailCache:
+    """Size-bounded on-disk cache of video thumbnails keyed by video ID.
+
+    Files are evicted least-recently-used first once the directory exceeds
+    max_bytes. The small variant is resized locally from the large one when
+    Pillow is available. ``fetch(url) -> bytes`` can be swapped out, and so
+    can base_url, to serve thumbnails from a local stand-in.
+    """
+
+    def __init__(self, directory=THUMBNAIL_DIR, max_bytes=THUMBNAIL_CACHE_BYTES,
+                 fetch=fetch_url, base_url=THUMBNAIL_BASE_URL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fetch = fetch
+        self.base_url = base_url.rstrip('/')
+        self._lock = threading.Lock()
+        self._files = None
+        self._total = 0
+        self._failures = {}
+        self._pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='thumbnail')
+
+    def get(self, video_id, variant='small'):
+        """Return thumbnail bytes for the video, fetching on a miss, or None if unavailable"""
+        if not is_video_id(video_id) or variant not in VARIANTS:
+            return None
+        name = f"{video_id}_{variant}.jpg"
+        data = self._read(name)
+        if data is not None:
+            return data
+        failed_at = self._failures.get(name)
+        if failed_at is not None and time_module.monotonic() - failed_at < FAILURE_RETRY_SECONDS:
+            return None
+        try:
+            data = self._download(video_id, variant)
+        except Exception as e:
+            logger.warning("Thumbnail fetch error (%s): %s", video_id, e)
+            self._failures[name] = time_module.monotonic()
+            return None
+        self._failures.pop(name, None)
+        self._write(name, data)
+        return data
+
+    def get_many(self, video_ids, variant='small'):
+        """Fetch several thumbnails in parallel; returns {video_id: bytes or None}"""
+        unique = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+        results = self._pool.map(lambda video_id: self.get(video_id, variant), unique)
+        return dict(zip(unique, results))
+
+    def size(self):
+        with self._lock:
+            self._load_index()
+            return self._total
+
+    def _download(self, video_id, variant):
+        max_width, fallback_file = VARIANTS[variant]
+        if max_width is None:
+            return self.fetch(f"{self.base_url}/{video_id}/{fallback_file}")
+        if Image is None:
+            return self.fetch(f"{self.base_url}/{video_id}/{fallback_file}")
+        # 큰 썸네일을 한 번 받아 두 변형 모두 캐시
+        large_name = f"{video_id}_large.jpg"
+        large = self._read(large_name)
+        if large is None:
+            large = self.fetch(f"{self.base_url}/{video_id}/{VARIANTS['large'][1]}")
+            self._write(large_name, large)
+        return _resize(large, max_width)
+
+    def _load_index(self):
+        # 디렉터리를 한 번만 스캔해서 수정 시각 순으로 LRU 순서 구성
+        if self._files is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith('.jpg'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        entries.sort()
+        self._files = OrderedDict((name, size) for _, name, size in entries)
+        self._total = sum(self._files.values())
+
+    def _read(self, name):
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            self._load_index()
+            if name not in self._files:
+                return None
+            self._files.move_to_end(name)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # 재시작 후에도 LRU 순서를 유지하도록 접근 시각을 수정 시각에 기록
+            os.utime(path)
+            return data
+        except OSError:
+            with self._lock:
+                self._total -= self._files.pop(name, 0)
+            return None
+
+    def _write(self, name, data):
+        path = os.path.join(self.directory, name)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            self._load_index()
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            self._total += len(data) - self._files.pop(name, 0)
+            self._files[name] = len(data)
+            while self._total > self.max_bytes and len(self._files) > 1:
+                old_name, old_size = self._files.popitem(last=False)
+                self._total -= old_size
+                try:
+                    os.remove(os.path.join(self.directory, old_name))
+                except OSError:
+                    pass
+
+
+# 프로세스 전역 썸네일 캐시
+thumbnail_cache = ThumbnailCache()